@@ -67,6 +67,10 @@ def run_migrations_online():
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        # Migrations run DDL that invalidates cached plans; disable psycopg's
+        # server-side prepared statements on this connection so statements
+        # executed around the DDL never hit a stale plan.
+        connect_args={"prepare_threshold": None},
     )
 
     with connectable.connect() as connection:
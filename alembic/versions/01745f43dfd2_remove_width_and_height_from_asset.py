@@ -21,13 +21,19 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade database schema."""
-    # Remove width and height columns from asset table
-    op.drop_column('asset', 'width')
-    op.drop_column('asset', 'height')
+    # Remove width and height columns from asset table. ALTER TABLE takes an
+    # ACCESS EXCLUSIVE lock; fail fast behind long-running queries instead of
+    # queueing and stalling all traffic on asset.
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        op.drop_column('asset', 'width')
+        op.drop_column('asset', 'height')
 
 
 def downgrade() -> None:
     """Downgrade database schema."""
     # Re-add width and height columns to asset table
-    op.add_column('asset', sa.Column('width', sa.Integer(), nullable=True))
-    op.add_column('asset', sa.Column('height', sa.Integer(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        op.add_column('asset', sa.Column('width', sa.Integer(), nullable=True))
+        op.add_column('asset', sa.Column('height', sa.Integer(), nullable=True))
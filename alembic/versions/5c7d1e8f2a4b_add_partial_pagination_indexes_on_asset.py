@@ -0,0 +1,45 @@
+"""add_partial_pagination_indexes_on_asset
+
+Revision ID: 5c7d1e8f2a4b
+Revises: 8b2f4a9c1d3e
+Create Date: 2026-08-30 14:05:12.774205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7d1e8f2a4b'
+down_revision: Union[str, None] = '8b2f4a9c1d3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema: partial indexes matching the list queries.
+
+    Asset listings filter on is_active and order by created_at DESC with a
+    limit; partial composite indexes let Postgres walk rows in result order
+    instead of sorting the whole filtered set. Built concurrently so writes
+    stay unblocked.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_asset_user_active_created "
+            "ON asset (user_id, created_at DESC) WHERE is_active"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_asset_session_active_created "
+            "ON asset (session_id, created_at DESC) WHERE is_active"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema: drop the pagination indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_asset_session_active_created")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_asset_user_active_created")
@@ -21,21 +21,43 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade database schema: remove metadata fields that are now stored in MinIO tags."""
-    # Drop columns that are replaced by MinIO tagging
-    op.drop_column('asset', 'style_subcategory')
-    op.drop_column('asset', 'mime_type')
-    op.drop_column('asset', 'file_size')
-    op.drop_column('asset', 'filename')
+    # Drop columns that are replaced by MinIO tagging. Bound the ACCESS
+    # EXCLUSIVE wait so the migration fails fast instead of blocking traffic.
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        op.drop_column('asset', 'style_subcategory')
+        op.drop_column('asset', 'mime_type')
+        op.drop_column('asset', 'file_size')
+        op.drop_column('asset', 'filename')
 
 
 def downgrade() -> None:
     """Downgrade database schema: restore metadata fields."""
-    # Restore dropped columns
-    op.add_column('asset', sa.Column('filename', sa.String(length=255), nullable=False, server_default=''))
-    op.add_column('asset', sa.Column('mime_type', sa.String(length=50), nullable=False, server_default='application/octet-stream'))
-    op.add_column('asset', sa.Column('file_size', sa.Integer(), nullable=True))
-    op.add_column('asset', sa.Column('style_subcategory', sa.String(length=50), nullable=True))
-    
-    # Remove server defaults after adding columns
-    op.alter_column('asset', 'filename', server_default=None)
-    op.alter_column('asset', 'mime_type', server_default=None)
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        # Restore all dropped columns in one ALTER TABLE so the ACCESS
+        # EXCLUSIVE lock is taken once. The columns are added nullable with a
+        # non-volatile default (metadata-only on Postgres 11+); NOT NULL is
+        # enforced below without rewriting or fully locking the table.
+        op.execute(
+            "ALTER TABLE asset "
+            "ADD COLUMN filename VARCHAR(255) DEFAULT '', "
+            "ADD COLUMN mime_type VARCHAR(50) DEFAULT 'application/octet-stream', "
+            "ADD COLUMN file_size INTEGER, "
+            "ADD COLUMN style_subcategory VARCHAR(50)"
+        )
+        # Enforce NOT NULL via a CHECK constraint added NOT VALID, then
+        # validated with only a SHARE UPDATE EXCLUSIVE lock.
+        op.execute(
+            "ALTER TABLE asset "
+            "ADD CONSTRAINT ck_asset_filename_not_null CHECK (filename IS NOT NULL) NOT VALID, "
+            "ADD CONSTRAINT ck_asset_mime_type_not_null CHECK (mime_type IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE asset VALIDATE CONSTRAINT ck_asset_filename_not_null")
+        op.execute("ALTER TABLE asset VALIDATE CONSTRAINT ck_asset_mime_type_not_null")
+        # Drop the bootstrap defaults in a single statement.
+        op.execute(
+            "ALTER TABLE asset "
+            "ALTER COLUMN filename DROP DEFAULT, "
+            "ALTER COLUMN mime_type DROP DEFAULT"
+        )
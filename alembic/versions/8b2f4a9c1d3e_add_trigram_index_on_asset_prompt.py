@@ -0,0 +1,41 @@
+"""add_trigram_index_on_asset_prompt
+
+Revision ID: 8b2f4a9c1d3e
+Revises: 647c6841e742
+Create Date: 2026-08-30 10:12:44.301958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2f4a9c1d3e'
+down_revision: Union[str, None] = '647c6841e742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema: index asset.prompt for ILIKE search.
+
+    Prompt search uses ILIKE '%q%', which sequentially scans the asset table
+    without a trigram index. CREATE INDEX CONCURRENTLY cannot run inside a
+    transaction, so the index is built in an autocommit block and stays
+    non-blocking for concurrent writes.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_asset_prompt_trgm "
+            "ON asset USING gin (prompt gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema: drop the trigram index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_asset_prompt_trgm")
@@ -21,11 +21,17 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade database schema."""
-    # Rename refined_prompt column to prompt in asset table
-    op.alter_column('asset', 'refined_prompt', new_column_name='prompt')
+    # Rename refined_prompt column to prompt in asset table. The rename is
+    # metadata-only but still needs ACCESS EXCLUSIVE; time out quickly rather
+    # than queue behind long-running queries.
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        op.alter_column('asset', 'refined_prompt', new_column_name='prompt')
 
 
 def downgrade() -> None:
     """Downgrade database schema."""
     # Rename prompt column back to refined_prompt in asset table
-    op.alter_column('asset', 'prompt', new_column_name='refined_prompt')
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = '3s'")
+        op.alter_column('asset', 'prompt', new_column_name='refined_prompt')
@@ -0,0 +1,108 @@
+"""OpenAI-Compatible LLM Adapter
+=============================
+Wraps any OpenAI-compatible chat-completions endpoint (for example a local
+Ollama server or an API proxy) behind the ADK ``BaseLlm`` interface so the
+prompt-refinement agents can run on top of it.
+"""
+
+from collections.abc import AsyncGenerator
+from functools import lru_cache
+
+import httpx
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai.types import Content, Part
+from openai import AsyncOpenAI
+
+from app.utils.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """Build the shared client for the configured OpenAI-compatible endpoint.
+
+    One client per process keeps a warm connection pool, so concurrent
+    completions reuse established TCP+TLS connections instead of paying the
+    handshake on every request.
+    """
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        ),
+    )
+
+
+def _build_messages(llm_request: LlmRequest) -> list[dict[str, str]]:
+    """Flatten ADK request contents into OpenAI chat messages."""
+    system_instruction = getattr(llm_request.config, "system_instruction", None)
+    messages: list[dict[str, str]] = (
+        [{"role": "system", "content": str(system_instruction)}]
+        if system_instruction
+        else []
+    )
+
+    # Single pass over contents; join straight from a generator so no
+    # intermediate per-message part list is materialized.
+    for content in llm_request.contents or ():
+        text = "\n\n".join(
+            part.text for part in (content.parts or ()) if getattr(part, "text", None)
+        )
+        if text:
+            messages.append(
+                {
+                    "role": "user" if content.role == "user" else "assistant",
+                    "content": text,
+                }
+            )
+
+    return messages
+
+
+def _text_response(text: str, *, partial: bool | None = None) -> LlmResponse:
+    """Wrap plain text in an ADK ``LlmResponse``."""
+    return LlmResponse(
+        content=Content(role="model", parts=[Part.from_text(text=text)]),
+        partial=partial,
+    )
+
+
+class OpenAIChatLlm(BaseLlm):
+    """ADK model adapter for OpenAI-compatible chat completion endpoints."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Generate content from the endpoint, streaming deltas when requested."""
+        client = get_openai_client()
+        messages = _build_messages(llm_request)
+
+        if stream:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+            )
+            collected: list[str] = []
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                collected.append(delta)
+                yield _text_response(delta, partial=True)
+            yield _text_response("".join(collected))
+            return
+
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+        )
+        text = response.choices[0].message.content or ""
+        yield _text_response(text)
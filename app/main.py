@@ -4,15 +4,22 @@ Initializes the FastAPI application with routes, middleware, exception handlers,
 and third-party integrations like Sentry and Logfire.
 """
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 import logfire
 import sentry_sdk
 import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
 from pydantic import ValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.routes import auth, health, user, agent
 from app.utils.config import settings
@@ -22,6 +29,50 @@ from app.utils.exceptions import (
     validation_error,
 )
 
+# Environments where outbound telemetry stays off.
+_NO_TELEMETRY_ENVIRONMENTS = frozenset({"local", "development"})
+
+# Settings is parsed once at import (module singleton); evaluate the guard
+# expressions once alongside it instead of on every create_app() call.
+_SENTRY_ENABLED = bool(settings.SENTRY_DSN) and settings.ENVIRONMENT != "development"
+_LOGFIRE_ENABLED = (
+    bool(settings.LOGFIRE_TOKEN)
+    and settings.ENVIRONMENT not in _NO_TELEMETRY_ENVIRONMENTS
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Widen the default executor so to_thread offloads are not queue-bound."""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=settings.THREAD_POOL_SIZE,
+        thread_name_prefix="app-worker",
+    )
+    loop.set_default_executor(executor)
+    try:
+        yield
+    finally:
+        executor.shutdown(wait=False)
+
+
+class MaxBodySizeMiddleware(BaseHTTPMiddleware):
+    """Reject oversized request bodies before Starlette spools them to disk.
+
+    Checks the declared Content-Length against settings.MAX_UPLOAD_BYTES so a
+    multi-GB multipart upload is refused with a 413 instead of being parsed.
+    """
+
+    async def dispatch(self, request, call_next):
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > settings.MAX_UPLOAD_BYTES:
+                return ORJSONResponse(
+                    status_code=413,
+                    content={"detail": "Request body too large"},
+                )
+        return await call_next(request)
+
 
 def create_app() -> FastAPI:
     init_sentry()
@@ -30,12 +81,15 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         generate_unique_id_function=custom_generate_unique_id,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
     app.add_exception_handler(StarletteHTTPException, http_validation_error)
     app.add_exception_handler(RequestValidationError, request_validation_error)
     app.add_exception_handler(ValidationError, validation_error)
 
+    app.add_middleware(MaxBodySizeMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -46,6 +100,8 @@ def create_app() -> FastAPI:
 
     app.include_router(create_api_router(), prefix=settings.API_V1_STR)
 
+    cache_openapi_schema(app)
+
     init_logfire(app)
 
     return app
@@ -55,8 +111,17 @@ def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+def cache_openapi_schema(app: FastAPI) -> None:
+    """Generate the OpenAPI schema once so docs requests reuse it.
+
+    The route set is fixed after router inclusion, so walking every route to
+    rebuild the schema on each /openapi.json hit is wasted work.
+    """
+    app.openapi_schema = app.openapi()
+
+
 def init_sentry() -> None:
-    if settings.SENTRY_DSN and settings.ENVIRONMENT != "development":
+    if _SENTRY_ENABLED:
         sentry_sdk.init(
             dsn=str(settings.SENTRY_DSN),
             enable_tracing=True,
@@ -64,7 +129,7 @@ def init_sentry() -> None:
 
 
 def init_logfire(app: FastAPI) -> None:
-    if settings.LOGFIRE_TOKEN and settings.ENVIRONMENT not in ["local", "development"]:
+    if _LOGFIRE_ENABLED:
         try:
             logfire.configure()
             logfire.instrument_fastapi(app)
@@ -72,17 +137,36 @@ def init_logfire(app: FastAPI) -> None:
             print(f"Warning: Failed to initialize Logfire: {e}")
 
 
+# Sub-routers mounted by create_api_router, declared once at import.
+_SUBROUTERS = (
+    (health.router, "/health", "health"),
+    (auth.router, "/auth", "auth"),
+    (user.router, "/user", "user"),
+    (agent.router, "/agent", "agent"),
+)
+
+
 def create_api_router() -> APIRouter:
     router = APIRouter()
 
-    router.include_router(health.router, prefix="/health", tags=["health"])
-    router.include_router(auth.router, prefix="/auth", tags=["auth"])
-    router.include_router(user.router, prefix="/user", tags=["user"])
-    router.include_router(agent.router, prefix="/agent", tags=["agent"])
+    for subrouter, prefix, tag in _SUBROUTERS:
+        router.include_router(subrouter, prefix=prefix, tags=[tag])
 
     return router
 
 
 if __name__ == "__main__":
-    app = create_app()
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools (both shipped by uvicorn[standard]) cut per-request
+    # event-loop and HTTP-parsing overhead; workers scale across cores outside
+    # local development.
+    workers = 1 if settings.ENVIRONMENT == "local" else (os.cpu_count() or 1)
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        log_level="info",
+    )
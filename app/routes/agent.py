@@ -1,21 +1,144 @@
 
-import base64
-from io import BytesIO
+import asyncio
+import os
+import time
+
+import orjson
+
+try:  # SIMD-accelerated base64 when available; same API as stdlib
+    import pybase64 as base64
+except ImportError:
+    import base64
+import mimetypes
+from functools import lru_cache
 from mimetypes import guess_type
-from pathlib import PurePosixPath
+from collections import OrderedDict
+from datetime import datetime
 from typing import Any, List, Optional
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile, Request
-from fastapi.responses import StreamingResponse
-from starlette.datastructures import Headers
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    Request,
+)
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 from app.services.agent.agent_service import AgentService
+from app.utils.config import settings
 from app.utils.delegate import (
     AgentRepositoryDep,
     AgentServiceDep,
     CurrentUser,
 )
 from app.utils.models import Asset, AssetType, ImageCategory, ImageRequest, ImageResponse
-router = APIRouter()
+from app.utils.storage import stat_object_by_path
+
+# Load the OS mime database at import so no request pays the lazy init.
+mimetypes.init()
+
+# orjson handles UUID/datetime natively, so payloads below carry them raw.
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Download URLs only vary by asset id; resolve the route templates once and
+# substitute instead of walking the route table per asset. The app-mounted
+# template (with the API prefix) is resolved lazily from the first request.
+_DOWNLOAD_TEMPLATE: str | None = None
+_APP_DOWNLOAD_TEMPLATE: str | None = None
+
+# The extensions this service actually stores; a dict hit skips the lock and
+# table walk inside mimetypes.guess_type, which falls back for cold types.
+_FAST_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".mp4": "video/mp4",
+    ".bin": "application/octet-stream",
+    ".pdf": "application/pdf",
+}
+
+
+# Previews are thumbnails, not transfers: anything larger than this is
+# served by download_url only instead of inflating the JSON by a third.
+_PREVIEW_MAX_BYTES = 512 * 1024
+
+# Encoded data URLs for recently listed assets; dashboard-style refreshes
+# re-serve the same previews, so a small LRU kills the repeat encodes.
+_PREVIEW_CACHE: OrderedDict[tuple[str, datetime], str] = OrderedDict()
+_PREVIEW_CACHE_MAX = 256
+
+# Serialized search responses for repeated identical queries. Keys include
+# the user's asset write generation, so uploads invalidate implicitly.
+_SEARCH_CACHE: OrderedDict[tuple[Any, ...], tuple[float, bytes]] = OrderedDict()
+_SEARCH_CACHE_TTL = 30.0
+_SEARCH_CACHE_MAX = 1024
+
+
+def _content_type_for(filename: str) -> str | None:
+    dot = filename.rfind(".")
+    if dot != -1:
+        fast = _FAST_MIME.get(filename[dot:].lower())
+        if fast:
+            return fast
+    return guess_type(filename)[0]
+
+
+def _download_path_for(asset_id: str) -> str:
+    global _DOWNLOAD_TEMPLATE
+    if _DOWNLOAD_TEMPLATE is None:
+        _DOWNLOAD_TEMPLATE = str(
+            router.url_path_for("download_media_asset", asset_id="__ID__")
+        )
+    return _DOWNLOAD_TEMPLATE.replace("__ID__", asset_id)
+
+
+def _app_download_path_for(request: Request, asset_id: str) -> str:
+    global _APP_DOWNLOAD_TEMPLATE
+    if _APP_DOWNLOAD_TEMPLATE is None:
+        _APP_DOWNLOAD_TEMPLATE = str(
+            request.app.url_path_for("download_media_asset", asset_id="__ID__")
+        )
+    return _APP_DOWNLOAD_TEMPLATE.replace("__ID__", asset_id)
+
+
+@lru_cache(maxsize=4096)
+def _serialize_asset_base(
+    asset_id: str,
+    asset_type: str | None,
+    session_id: str | None,
+    object_path: str | None,
+    bucket_name: str | None,
+    prompt: str | None,
+    created_at: datetime,
+) -> dict[str, Any]:
+    """Build the request-independent part of an asset payload, memoized.
+
+    Every field is part of the cache key, so a mutated asset simply produces
+    a new entry; no explicit invalidation is needed.
+    """
+    path = object_path or ""
+    # Plain string split beats constructing a PurePosixPath per asset.
+    filename = path.rsplit("/", 1)[-1]
+    content_type = _content_type_for(filename or path)
+    download_path = _download_path_for(asset_id)
+
+    return {
+        "id": asset_id,
+        "asset_type": asset_type,
+        "session_id": session_id,
+        "object_path": object_path,
+        "bucket_name": bucket_name,
+        "prompt": prompt,
+        "created_at": created_at,
+        "filename": filename or None,
+        "content_type": content_type,
+        "download_url": download_path,
+    }
 
 
 def serialize_asset(
@@ -30,35 +153,41 @@ def serialize_asset(
         if isinstance(asset.asset_type, AssetType)
         else asset.asset_type
     )
-    object_path = asset.object_path or ""
-    filename = getattr(asset, "filename", "") or PurePosixPath(object_path).name
-    content_type, _ = guess_type(filename or object_path)
-    download_path = router.url_path_for(
-        "download_media_asset", asset_id=str(asset.id)
-    )
-    download_url = (
-        str(request.url_for("download_media_asset", asset_id=str(asset.id)))
-        if request
-        else download_path
+    asset_id = str(asset.id)
+
+    payload = dict(
+        _serialize_asset_base(
+            asset_id,
+            asset_type,
+            asset.session_id,
+            asset.object_path,
+            asset.bucket_name,
+            asset.prompt,
+            asset.created_at,
+        )
     )
-
-    payload = {
-        "id": str(asset.id),
-        "asset_type": asset_type,
-        "session_id": asset.session_id,
-        "object_path": asset.object_path,
-        "bucket_name": asset.bucket_name,
-        "prompt": asset.prompt,
-        "created_at": asset.created_at.isoformat(),
-        "filename": filename or None,
-        "content_type": content_type,
-        "download_url": download_url,
-    }
-    if data_bytes is not None:
-        data_mime = content_type or "application/octet-stream"
-        payload["data_url"] = (
-            f"data:{data_mime};base64,{base64.b64encode(data_bytes).decode()}"
+    content_type = payload["content_type"]
+    if request:
+        # Absolute URL = request host + cached app path; skips the per-asset
+        # url_for route lookup.
+        payload["download_url"] = str(request.base_url).rstrip("/") + (
+            _app_download_path_for(request, asset_id)
         )
+    if data_bytes is not None and len(data_bytes) <= _PREVIEW_MAX_BYTES:
+        cache_key = (asset_id, asset.updated_at)
+        data_url = _PREVIEW_CACHE.get(cache_key)
+        if data_url is None:
+            data_mime = content_type or "application/octet-stream"
+            data_url = (
+                b"data:%s;base64,%s"
+                % (data_mime.encode(), base64.b64encode(data_bytes))
+            ).decode("ascii")
+            _PREVIEW_CACHE[cache_key] = data_url
+            if len(_PREVIEW_CACHE) > _PREVIEW_CACHE_MAX:
+                _PREVIEW_CACHE.popitem(last=False)
+        else:
+            _PREVIEW_CACHE.move_to_end(cache_key)
+        payload["data_url"] = data_url
 
     return payload
 
@@ -71,40 +200,61 @@ async def generate_image(
     aspect_ratio: Optional[str] = Form(None),
     session_id: Optional[str] = Form(None),
     category: Optional[ImageCategory] = Form(None),
+    inline: bool = Query(
+        True, description="Embed the generated image as a base64 data URL"
+    ),
     *,
+    background_tasks: BackgroundTasks,
     current_user: CurrentUser,
     agent_service: AgentServiceDep,
 ):
     """Generate an image using AI agents based on user prompt and uploaded files."""
+    # Partition on the content-type header in one pass; only the small text
+    # sidecar files (asset-id lists) are ever read, and those with a hard cap
+    # since they carry UUIDs, not payloads.
+    text_files: list[UploadFile] = []
+    image_files: list[UploadFile] = []
+    for f in files or []:
+        if f.content_type and f.content_type.startswith("text/"):
+            text_files.append(f)
+        else:
+            image_files.append(f)
+
+    raw_tokens = await asyncio.gather(*(f.read(4096) for f in text_files))
     asset_ids = [
-        (await f.read()).decode().strip()
-        for f in files or []
-        if f.content_type and f.content_type.startswith("text/")
-    ]
-    
-    image_files = [
-        f for f in files or []
-        if not (f.content_type and f.content_type.startswith("text/"))
+        token
+        for raw in raw_tokens
+        if (token := raw.decode("ascii", "ignore").strip())
     ]
 
+    extra_blobs: list[tuple[bytes, str]] = []
     if asset_ids:
-        blobs = await agent_service.load_model_assets(
+        # Keep referenced model assets as raw (bytes, mime) payloads; the
+        # service consumes them directly, so there is no need to wrap them
+        # back into UploadFile objects.
+        extra_blobs = await agent_service.load_model_assets(
             model_asset_ids=",".join(asset_ids), user_id=current_user.id
         )
-        image_files.extend(
-            UploadFile(
-                filename=f"model_{i}.bin",
-                file=BytesIO(blob),
-                headers=Headers({"content-type": mime}),
-            )
-            for i, (blob, mime) in enumerate(blobs)
-        )
 
-    if not image_files:
+    if not image_files and not extra_blobs:
         raise HTTPException(status_code=400, detail="At least one image file is required")
-    if len(image_files) > 3:
+    if len(image_files) + len(extra_blobs) > 3:
         raise HTTPException(status_code=400, detail="Maximum 3 images allowed")
 
+    # Cheap guards before the expensive agent/generation leg: a disallowed or
+    # oversized upload should cost a rejection, not an LLM round trip.
+    for f in image_files:
+        if f.content_type and f.content_type not in settings.ALLOWED_IMAGE_MIME_TYPES:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported image type {f.content_type}",
+            )
+        if f.size and f.size > settings.MAX_UPLOAD_FILE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File {f.filename or ''} exceeds the per-file size limit",
+            )
+
     request = ImageRequest(
         prompt=prompt,
         files=image_files,
@@ -112,11 +262,14 @@ async def generate_image(
         aspect_ratio=aspect_ratio,
         session_id=session_id,
         category=category,
+        extra_blobs=extra_blobs,
     )
 
     return await agent_service.generate_image(
         request=request,
         user_id=current_user.id,
+        inline=inline,
+        background=background_tasks,
     )
 
 
@@ -138,31 +291,87 @@ async def upload_media(
     if collection not in {"media", "models", "style"}:
         raise HTTPException(status_code=400, detail="Invalid collection")
 
-    upload_handlers = {
-        "media": agent_service.upload_and_track_media,
-        "models": agent_service.upload_and_track_model,
-        "style": agent_service.upload_and_track_style,
-    }
-
-    uploaded_assets = []
+    # Fail oversized payloads before any storage round trip. The middleware
+    # bounds the declared body; this also catches per-file excess and
+    # chunked uploads where sizes arrive from the multipart parser.
+    total_size = 0
     for file in files:
-        content = await file.read()
+        if file.size:
+            if file.size > settings.MAX_UPLOAD_FILE_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File {file.filename or ''} exceeds the per-file size limit",
+                )
+            total_size += file.size
+    if total_size > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload payload too large")
+
+    # Uploads are independent MinIO round-trips; run them concurrently with a
+    # bounded semaphore so total latency approaches a single PUT instead of
+    # the sum of all of them.
+    upload_semaphore = asyncio.Semaphore(8)
+
+    async def _upload_one(file: UploadFile) -> dict[str, Any]:
         filename = AgentService.generate_storage_filename(
             file.filename or "unknown",
             file.content_type or "application/octet-stream"
         )
 
-        asset = await upload_handlers[collection](
-            user_id=current_user.id,
-            filename=filename,
-            data=content,
-            content_type=file.content_type or "application/octet-stream",
-        )
-        
-        uploaded_assets.append({
-            "id": str(asset.id),
-            "created_at": asset.created_at.isoformat(),
-        })
+        # Hand the spooled upload straight to MinIO instead of copying it
+        # into an intermediate bytes object. Starlette fills size from the
+        # multipart parser; failing that, fstat the spooled file (rolled to
+        # disk) and only fall back to a seek/tell scan for in-memory spools.
+        size = file.size
+        if size is None:
+            try:
+                size = os.fstat(file.file.fileno()).st_size
+            except (AttributeError, OSError):
+                file.file.seek(0, 2)
+                size = file.file.tell()
+        file.file.seek(0)
+
+        # Stage the insert (commit=False); one commit below covers the batch
+        # instead of a transaction and fsync per file.
+        content_type = file.content_type or "application/octet-stream"
+        async with upload_semaphore:
+            if collection == "media":
+                asset = await agent_service.upload_and_track_media(
+                    user_id=current_user.id,
+                    filename=filename,
+                    data=file.file,
+                    size=size,
+                    content_type=content_type,
+                    commit=False,
+                )
+            elif collection == "models":
+                asset = await agent_service.upload_and_track_model(
+                    user_id=current_user.id,
+                    filename=filename,
+                    data=file.file,
+                    size=size,
+                    content_type=content_type,
+                    commit=False,
+                )
+            else:
+                asset = await agent_service.upload_and_track_style(
+                    user_id=current_user.id,
+                    filename=filename,
+                    data=file.file,
+                    size=size,
+                    content_type=content_type,
+                    style_subcategory=style_subcategory or "general",
+                    commit=False,
+                )
+
+        # orjson serializes UUID and datetime natively; no Python-level
+        # stringification needed.
+        return {
+            "id": asset.id,
+            "created_at": asset.created_at,
+        }
+
+    uploaded_assets = list(await asyncio.gather(*(_upload_one(f) for f in files)))
+    await agent_service.commit_pending_assets()
 
     return {
         "success": True,
@@ -181,60 +390,94 @@ async def list_user_media(
     style_subcategory: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 50,
+    created_before: Optional[datetime] = Query(
+        None,
+        description="Keyset cursor: return assets created strictly before this "
+        "timestamp. When set, skip is ignored and deep pages stay cheap.",
+    ),
     include_data: bool = Query(False, description="Embed base64 previews when true"),
 ):
     """List uploaded assets for the current user by collection."""
     collection = (collection or "all").strip().lower()
-    
-    list_handlers = {
-        "all": lambda: agent_service.get_user_assets(
+
+    # Dispatch directly instead of building a dict of lambdas per request.
+    if collection == "all":
+        assets, total = await agent_service.get_user_assets(
             user_id=current_user.id,
             skip=skip,
             limit=limit,
-        ),
-        "media": lambda: agent_service.get_user_media(
+            created_before=created_before,
+        )
+    elif collection == "media":
+        assets, total = await agent_service.get_user_media(
             user_id=current_user.id,
             skip=skip,
             limit=limit,
-        ),
-        "models": lambda: agent_service.get_model_assets(
+            created_before=created_before,
+        )
+    elif collection == "models":
+        assets, total = await agent_service.get_model_assets(
             user_id=current_user.id,
             skip=skip,
             limit=limit,
-        ),
-        "style": lambda: agent_service.get_style_assets(
+            created_before=created_before,
+        )
+    elif collection == "style":
+        assets, total = await agent_service.get_style_assets(
             style_subcategory=style_subcategory,
             skip=skip,
             limit=limit,
-        ),
-    }
-
-    if collection not in list_handlers:
+            created_before=created_before,
+        )
+    else:
         raise HTTPException(status_code=400, detail="Invalid collection")
-
-    assets = list_handlers[collection]()
+    # Stringify each UUID once; the fetch map and serialize loop reuse it.
+    asset_id_strs = [str(asset.id) for asset in assets]
     asset_data: dict[str, bytes | None] = {}
 
     if include_data:
-        for asset in assets:
-            try:
-                data = await agent_service.fetch_asset_bytes(asset)
-            except FileNotFoundError:
-                data = None
-            asset_data[str(asset.id)] = data
-
-    serialized_assets = [
-        serialize_asset(
-            asset,
-            request,
-            data_bytes=asset_data.get(str(asset.id)),
+        # Fetch previews concurrently: each is an independent MinIO round
+        # trip, so bounded fan-out turns N sequential RTTs into ~N/16.
+        fetch_semaphore = asyncio.Semaphore(16)
+
+        async def _fetch_one(asset: Asset) -> bytes | None:
+            async with fetch_semaphore:
+                try:
+                    return await agent_service.fetch_asset_bytes(asset)
+                except FileNotFoundError:
+                    return None
+
+        asset_data = dict(
+            zip(
+                asset_id_strs,
+                await asyncio.gather(*(_fetch_one(asset) for asset in assets)),
+            )
         )
-        for asset in assets
-    ]
+
+    def _serialize_page() -> list[dict[str, Any]]:
+        return [
+            serialize_asset(
+                asset,
+                request,
+                data_bytes=asset_data.get(asset_id),
+            )
+            for asset, asset_id in zip(assets, asset_id_strs)
+        ]
+
+    if include_data:
+        # Base64-encoding a page of previews is CPU-bound; run it in a worker
+        # thread so the event loop keeps serving other requests.
+        serialized_assets = await asyncio.to_thread(_serialize_page)
+    else:
+        serialized_assets = _serialize_page()
 
     return {
-        "total": len(assets),
+        "total": total,
         "assets": serialized_assets,
+        # Pass back as created_before to fetch the next page without OFFSET.
+        # A full page suggests more rows; an empty page (e.g. limit=0) has no
+        # cursor to hand back.
+        "next_cursor": assets[-1].created_at if assets and len(assets) == limit else None,
     }
 
 
@@ -248,7 +491,7 @@ async def get_media_asset(
     include_data: bool = Query(False, description="Embed a base64 preview when true"),
 ):
     """Get a specific media asset by ID."""
-    asset = agent_service.resolve_asset_by_identifier(asset_id, current_user.id)
+    asset = await agent_service.resolve_asset_by_identifier(asset_id, current_user.id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
 
@@ -265,26 +508,41 @@ async def get_media_asset(
 @router.get("/media/{asset_id}/download", name="download_media_asset")
 async def download_media_asset(
     asset_id: str,
+    request: Request,
     *,
     current_user: CurrentUser,
     agent_service: AgentServiceDep,
 ):
     """Stream the binary contents of a stored asset by its identifier."""
-    asset = agent_service.resolve_asset_by_identifier(asset_id, current_user.id)
+    asset = await agent_service.resolve_asset_by_identifier(asset_id, current_user.id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
 
-    data = await agent_service.fetch_asset_bytes(asset)
-    filename = getattr(asset, "filename", "") or PurePosixPath(
-        asset.object_path or ""
-    ).name or f"{asset.id}"
-    media_type = guess_type(filename)[0] or "application/octet-stream"
+    filename = (
+        getattr(asset, "filename", "")
+        or (asset.object_path or "").rsplit("/", 1)[-1]
+        or f"{asset.id}"
+    )
+    media_type = _content_type_for(filename) or "application/octet-stream"
     headers = {}
     if filename:
         headers["Content-Disposition"] = f'inline; filename="{filename}"'
 
+    # Propagate object metadata so clients and CDNs can cache, resume, and
+    # issue conditional GETs instead of re-downloading the full asset.
+    if asset.object_path:
+        size, etag = await stat_object_by_path(asset.object_path)
+        if etag:
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+        if size is not None:
+            headers["Content-Length"] = str(size)
+        headers["Accept-Ranges"] = "bytes"
+        headers["Cache-Control"] = "private, max-age=300"
+
     return StreamingResponse(
-        BytesIO(data),
+        agent_service.open_asset_stream(asset),
         media_type=media_type,
         headers=headers,
     )
@@ -302,16 +560,41 @@ async def search_prompts(
     if not q.strip():
         raise HTTPException(status_code=400, detail="Search query cannot be empty")
 
-    assets = agent_repository.search_assets_by_prompt(current_user.id, q, limit)
-    return {
-        "query": q,
-        "total": len(assets),
-        "results": [
-            {
-                "id": str(asset.id),
-                "prompt": asset.prompt,
-                "created_at": asset.created_at.isoformat(),
-            }
-            for asset in assets
-        ],
-    }
+    # Normalize once and use the same form for the cache key, the search, and
+    # the echoed query, so equivalent requests share an entry and the cached
+    # body never reflects another request's casing. The ilike search is
+    # case-insensitive, so lowercasing does not change the results.
+    normalized_q = q.strip().lower()
+    cache_key = (
+        current_user.id,
+        AgentService.asset_generation(current_user.id),
+        normalized_q,
+        limit,
+    )
+    now = time.monotonic()
+    cached = _SEARCH_CACHE.get(cache_key)
+    if cached and cached[0] > now:
+        return Response(content=cached[1], media_type="application/json")
+
+    assets, total = await agent_repository.search_assets_by_prompt(
+        current_user.id, normalized_q, limit
+    )
+    body = orjson.dumps(
+        {
+            "query": normalized_q,
+            "total": total,
+            "results": [
+                {
+                    "id": asset.id,
+                    "prompt": asset.prompt,
+                    "created_at": asset.created_at,
+                }
+                for asset in assets
+            ],
+        }
+    )
+    _SEARCH_CACHE[cache_key] = (now + _SEARCH_CACHE_TTL, body)
+    if len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+        _SEARCH_CACHE.popitem(last=False)
+
+    return Response(content=body, media_type="application/json")
@@ -28,11 +28,11 @@ router = APIRouter()
 
 
 @router.post("/login")
-def login_with_email_password(
+async def login_with_email_password(
     user_service: UserServiceDep, credentials: EmailPasswordLogin, response: Response
 ) -> TokenWithRefresh:
     """Authenticate user with email and password"""
-    user = user_service.authenticate(credentials.email, credentials.password)
+    user = await user_service.authenticate(credentials.email, credentials.password)
 
     if not user:
         raise HTTPException(
@@ -51,7 +51,7 @@ def login_with_email_password(
 
 
 @router.post("/register")
-def register_user(
+async def register_user(
     user_service: UserServiceDep,
     response: Response,
     name: str = Form(...),
@@ -74,7 +74,7 @@ def register_user(
     user_in = UserRegister(name=name, account=account, email=email, password=password)
 
     try:
-        registered_user = user_service.register_user(user_in)
+        registered_user = await user_service.register_user(user_in)
         response.status_code = status.HTTP_201_CREATED
         return registered_user
     except ValueError as e:
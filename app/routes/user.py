@@ -27,7 +27,7 @@ def get_user_me(current_user: CurrentUser, response: Response) -> UserPublic:
 
 
 @router.get("/search")
-def search_users(
+async def search_users(
     user_service: UserServiceDep,
     _: CurrentUser,
     q: str = Query(..., min_length=2),
@@ -37,15 +37,15 @@ def search_users(
 ) -> UsersPublic:
     """Search users"""
     response.status_code = status.HTTP_200_OK
-    return user_service.search_users(q, skip, limit)
+    return await user_service.search_users(q, skip, limit)
 
 
 @router.get("/{account}/lookup")
-def get_user_by_account(
+async def get_user_by_account(
     account: str, user_service: UserServiceDep, _: CurrentUser, response: Response
 ) -> UserPublic:
     """Get user by account"""
-    user = user_service.get_user_by_account(account)
+    user = await user_service.get_user_by_account(account)
 
     if not user:
         raise HTTPException(
@@ -57,12 +57,12 @@ def get_user_by_account(
 
 
 @router.post("/delete")
-def soft_delete_user(
+async def soft_delete_user(
     user_service: UserServiceDep, current_user: CurrentUser, response: Response
 ) -> Message:
     """Soft delete current user"""
     try:
-        user_service.soft_delete_user(current_user.id)
+        await user_service.soft_delete_user(current_user.id)
         response.status_code = status.HTTP_202_ACCEPTED
         return Message(message="SCHEDULED_FOR_DELETION")
     except ValueError as e:
@@ -70,11 +70,11 @@ def soft_delete_user(
 
 
 @router.post("/recover")
-def recover_user_account(
+async def recover_user_account(
     user_service: UserServiceDep, current_user: CurrentUser, response: Response
 ) -> Message:
     """Recover user account"""
-    success = user_service.recover_user(current_user.id)
+    success = await user_service.recover_user(current_user.id)
 
     if not success:
         raise HTTPException(
@@ -86,7 +86,7 @@ def recover_user_account(
 
 
 @router.post("/update")
-def update_user_profile(
+async def update_user_profile(
     user_service: UserServiceDep,
     user_in: UserUpdate,
     current_user: CurrentUser,
@@ -94,7 +94,7 @@ def update_user_profile(
 ) -> UserPublic:
     """Update current user profile"""
     try:
-        updated_user = user_service.update_user(current_user.id, user_in)
+        updated_user = await user_service.update_user(current_user.id, user_in)
         response.status_code = status.HTTP_200_OK
         return updated_user
     except ValueError as e:
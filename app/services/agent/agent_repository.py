@@ -6,7 +6,9 @@ Handles all agent and asset-related database operations.
 import uuid
 from datetime import UTC, datetime
 
-from sqlmodel import Session, select, or_
+from sqlalchemy import case, func
+from sqlmodel import select, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.utils.models import Asset, AssetType
 
@@ -14,12 +16,12 @@ from app.utils.models import Asset, AssetType
 class AgentRepository:
     """Repository for Agent and Asset database operations."""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     # ===== Asset Methods =====
 
-    def create_asset(
+    async def create_asset(
         self,
         *,
         asset_id: uuid.UUID | None = None,
@@ -32,8 +34,13 @@ class AgentRepository:
         source_model_ids: list[uuid.UUID] | None = None,
         source_style_id: uuid.UUID | None = None,
         prompt: str | None = None,
+        commit: bool = True,
     ) -> Asset:
-        """Create a new asset record in the database."""
+        """Create a new asset record in the database.
+
+        Pass commit=False to stage the insert and batch several assets into
+        one transaction via commit_pending().
+        """
         asset = Asset(
             id=asset_id or uuid.uuid4(),
             object_path=object_path,
@@ -46,39 +53,73 @@ class AgentRepository:
             prompt=prompt,
         )
         self.session.add(asset)
-        self.session.commit()
-        self.session.refresh(asset)
+        if commit:
+            await self.session.commit()
         return asset
 
-    def get_asset_by_id(self, asset_id: uuid.UUID) -> Asset | None:
+    async def commit_pending(self) -> None:
+        """Commit all staged asset records in a single transaction."""
+        await self.session.commit()
+
+    async def get_asset_by_id(self, asset_id: uuid.UUID) -> Asset | None:
         """Retrieve an asset by its ID."""
-        return self.session.get(Asset, asset_id)
+        return await self.session.get(Asset, asset_id)
+
+    async def get_assets_by_ids(
+        self, asset_ids: list[uuid.UUID], user_id: uuid.UUID
+    ) -> list[Asset]:
+        """Fetch a batch of active assets owned by the user in one query."""
+        if not asset_ids:
+            return []
+        statement = select(Asset).where(
+            Asset.id.in_(asset_ids),
+            Asset.user_id == user_id,
+            Asset.is_active == True,
+        )
+        return list((await self.session.exec(statement)).all())
 
-    def get_asset_by_path(self, object_path: str) -> Asset | None:
+    async def get_asset_by_path(self, object_path: str) -> Asset | None:
         """Retrieve an asset by its object path."""
         statement = select(Asset).where(Asset.object_path == object_path)
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
+
+    @staticmethod
+    def _page_with_total(rows) -> tuple[list[Asset], int]:
+        """Unzip (Asset, windowed total) rows into a page and its total."""
+        if not rows:
+            return [], 0
+        return [asset for asset, _ in rows], rows[0][1]
 
-    def list_user_assets(
+    async def list_user_assets(
         self,
         user_id: uuid.UUID,
         asset_type: AssetType | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[Asset]:
-        """List assets for a specific user, optionally filtered by type."""
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
+        """List assets for a specific user, optionally filtered by type.
+
+        Returns the page plus the total matching count from a count(*)
+        window in the same query. Pass created_before for keyset pagination:
+        the page starts below the cursor and offset is ignored, so deep pages
+        stay O(limit) instead of scanning offset rows.
+        """
         statement = (
-            select(Asset)
+            select(Asset, func.count().over().label("total"))
             .where(Asset.user_id == user_id, Asset.is_active == True)
             .order_by(Asset.created_at.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if created_before is not None:
+            statement = statement.where(Asset.created_at < created_before)
+        else:
+            statement = statement.offset(offset)
         if asset_type:
             statement = statement.where(Asset.asset_type == asset_type)
-        return list(self.session.exec(statement).all())
+        return self._page_with_total((await self.session.exec(statement)).all())
 
-    def list_assets_by_session(
+    async def list_assets_by_session(
         self, session_id: str, user_id: uuid.UUID | None = None
     ) -> list[Asset]:
         """List all assets associated with a specific session."""
@@ -88,128 +129,137 @@ class AgentRepository:
         if user_id:
             statement = statement.where(Asset.user_id == user_id)
         statement = statement.order_by(Asset.created_at.desc())
-        return list(self.session.exec(statement).all())
+        return list((await self.session.exec(statement)).all())
 
-    def list_style_assets(
+    async def list_style_assets(
         self,
         *,
         style_subcategory: str | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[Asset]:
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
         """List style assets, optionally filtered by subcategory."""
         statement = (
-            select(Asset)
+            select(Asset, func.count().over().label("total"))
             .where(Asset.asset_type == AssetType.STYLE, Asset.is_active == True)
             .order_by(Asset.created_at.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if created_before is not None:
+            statement = statement.where(Asset.created_at < created_before)
+        else:
+            statement = statement.offset(offset)
         if style_subcategory:
             statement = statement.where(Asset.style_subcategory == style_subcategory)
-        return list(self.session.exec(statement).all())
+        return self._page_with_total((await self.session.exec(statement)).all())
 
-    def list_model_assets(
+    async def list_model_assets(
         self,
         *,
         limit: int = 100,
         offset: int = 0,
         user_id: uuid.UUID | None = None,
-    ) -> list[Asset]:
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
         """List model reference assets."""
         statement = (
-            select(Asset)
+            select(Asset, func.count().over().label("total"))
             .where(Asset.asset_type == AssetType.MODEL, Asset.is_active == True)
             .order_by(Asset.created_at.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if created_before is not None:
+            statement = statement.where(Asset.created_at < created_before)
+        else:
+            statement = statement.offset(offset)
         if user_id:
             statement = statement.where(Asset.user_id == user_id)
-        return list(self.session.exec(statement).all())
+        return self._page_with_total((await self.session.exec(statement)).all())
 
-    def soft_delete_asset(self, asset_id: uuid.UUID) -> Asset | None:
+    async def soft_delete_asset(self, asset_id: uuid.UUID) -> Asset | None:
         """Soft delete an asset by marking it as inactive."""
-        asset = self.get_asset_by_id(asset_id)
+        asset = await self.get_asset_by_id(asset_id)
         if not asset:
             return None
         asset.is_active = False
         asset.deleted_at = datetime.now(UTC)
         self.session.add(asset)
-        self.session.commit()
-        self.session.refresh(asset)
+        await self.session.commit()
         return asset
 
-    def update_asset_visibility(
+    async def update_asset_visibility(
         self, asset_id: uuid.UUID, is_public: bool
     ) -> Asset | None:
         """Update the public visibility of an asset."""
-        asset = self.get_asset_by_id(asset_id)
+        asset = await self.get_asset_by_id(asset_id)
         if not asset:
             return None
         asset.is_public = is_public
         asset.updated_at = datetime.now(UTC)
         self.session.add(asset)
-        self.session.commit()
-        self.session.refresh(asset)
+        await self.session.commit()
         return asset
 
-    def resolve_asset_by_identifier(
+    async def resolve_asset_by_identifier(
         self, identifier: str, user_id: uuid.UUID
     ) -> Asset | None:
-        """Resolve an asset for a user by UUID, filename, or object path.
+        """Resolve an asset for a user by UUID or object path.
 
         Supports flexible matching:
         - Direct UUID match
-        - Exact filename or object_path match
-        - Partial filename match (with extension guessing)
-        - Partial path match
+        - Exact object_path match
+        - Basename match against the end of object_path (with extension
+          guessing when the identifier has none)
         """
-        from sqlalchemy import or_
-
         normalized = identifier.strip()
 
-        # Try UUID first
+        # Classify the identifier up front so each shape costs exactly one
+        # DB hit: UUIDs go through the identity map, everything else through
+        # a single ranked select.
         try:
             asset_uuid = uuid.UUID(normalized)
-            asset = self.get_asset_by_id(asset_uuid)
+        except ValueError:
+            asset_uuid = None
+
+        if asset_uuid is not None:
+            asset = await self.get_asset_by_id(asset_uuid)
             if asset and asset.user_id == user_id and asset.is_active:
                 return asset
             return None
-        except ValueError:
-            pass
-
-        # Build filename/path conditions
-        base_conditions = [
-            Asset.object_path == normalized,
-            Asset.filename == normalized,
-        ]
 
+        exact_match = Asset.object_path == normalized
         if "." not in normalized:
-            # If no extension, try fuzzy matching
-            base_conditions.append(Asset.filename.like(f"{normalized}.%"))
-            base_conditions.append(Asset.object_path.like(f"%/{normalized}.%"))
+            # If no extension, try fuzzy matching on the path basename
+            fuzzy_match = Asset.object_path.like(f"%/{normalized}.%")
         else:
-            base_conditions.append(Asset.object_path.like(f"%/{normalized}"))
+            fuzzy_match = Asset.object_path.like(f"%/{normalized}")
 
+        # Rank exact path hits above basename hits so one query returns the
+        # best match instead of probing per condition.
         statement = (
             select(Asset)
             .where(
                 Asset.user_id == user_id,
                 Asset.is_active == True,
-                or_(*base_conditions),
+                or_(exact_match, fuzzy_match),
             )
-            .order_by(Asset.created_at.desc())
+            .order_by(case((exact_match, 0), else_=1), Asset.created_at.desc())
+            .limit(1)
         )
 
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
 
-    def search_assets_by_prompt(
+    async def search_assets_by_prompt(
         self, user_id: uuid.UUID, search_query: str, limit: int = 20
-    ) -> list[Asset]:
-        """Search user's media assets by prompt text."""
+    ) -> tuple[list[Asset], int]:
+        """Search user's media assets by prompt text.
+
+        Returns the page of matching assets plus the total match count,
+        computed with a window function so a single query serves both.
+        """
         statement = (
-            select(Asset)
+            select(Asset, func.count().over().label("total"))
             .where(
                 Asset.user_id == user_id,
                 Asset.asset_type == AssetType.MEDIA,
@@ -219,4 +269,7 @@ class AgentRepository:
             .order_by(Asset.created_at.desc())  # type: ignore
             .limit(limit)
         )
-        return list(self.session.exec(statement).all())
+        rows = (await self.session.exec(statement)).all()
+        if not rows:
+            return [], 0
+        return [asset for asset, _ in rows], rows[0][1]
@@ -1,15 +1,22 @@
-import base64
+import binascii
+import hashlib
 import os
 import re
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from functools import lru_cache
+from typing import BinaryIO, ClassVar
 from mimetypes import guess_extension
-from fastapi import HTTPException
+from fastapi import BackgroundTasks, HTTPException
 from pathlib import Path
 import asyncio
 from app.services.agent.agent_repository import AgentRepository
 from app.utils.agent_helpers import (
-    SYSTEM_AGENT_AUTHOR,
     append_session_event,
+    detect_image_mime,
     ensure_session_exists,
     fetch_prompt,
     finish_session_turn,
@@ -22,6 +29,8 @@ from app.utils.agent_helpers import (
 from app.utils.config import settings
 from app.utils.storage import (
     fetch_object_by_path,
+    presign_get_by_path,
+    stream_object_by_path,
     upload_model_asset,
     upload_style_asset,
     upload_user_media,
@@ -37,38 +46,129 @@ from app.utils.models import (
 )
 
 
+# Resolved-asset cache shared across requests: repeated hits on the same
+# asset (preview then download, retries, gallery polling) skip the lookup
+# query for a short window. Entries are (expires_at, asset) keyed by
+# (user_id, identifier); write paths invalidate the owning user's entries.
+_RESOLVE_CACHE: dict[tuple[uuid.UUID, str], tuple[float, Asset]] = {}
+_RESOLVE_CACHE_TTL = 60.0
+_RESOLVE_CACHE_MAX = 10_000
+
+# Per-user write generation, bumped on every asset mutation. Read-side
+# caches include it in their keys so stale entries miss naturally.
+_ASSET_GENERATION: dict[uuid.UUID, int] = {}
+
+# Refined prompts for previously seen (category, style, aspect, prompt)
+# inputs. The agent round-trip dominates generation latency, so repeated
+# prompts skip it entirely.
+_REFINED_PROMPT_CACHE: OrderedDict[str, str] = OrderedDict()
+_REFINED_PROMPT_CACHE_MAX = 512
+
+
+def _refinement_cache_key(*parts: str | None) -> str:
+    """Stable digest over the inputs that determine a refined prompt."""
+    joined = "\x1f".join(part or "" for part in parts)
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+# Local media output directory, resolved once at import so the request path
+# avoids a getcwd syscall and path join per call.
+_OUT_DIR = Path.cwd() / "generated-img"
+
+# Directories already created for local media persistence; skips the
+# os.makedirs syscall on every generation after the first.
+_MEDIA_DIRS: set[str] = set()
+
+# Bounds in-flight agent + image-generation calls; shared across requests so
+# a burst of generations queues here rather than saturating the upstream APIs.
+_GEN_SEMAPHORE = asyncio.Semaphore(settings.MAX_CONCURRENT_IMAGE_GENS)
+
+# Small LRU of locally persisted media bytes so repeated fallback reads of
+# the same file skip the disk. Large files are never cached.
+_LOCAL_BYTES_CACHE: OrderedDict[str, bytes] = OrderedDict()
+_LOCAL_BYTES_CACHE_MAX = 64
+_LOCAL_BYTES_MAX_ENTRY = 256 * 1024
+
+
+def _encode_data_url(mime: str, data: bytes) -> str:
+    """Encode bytes as a base64 data URL with one fewer copy.
+
+    binascii.b2a_base64 with newline=False is the C fast path underneath
+    base64.b64encode without the wrapper overhead; decoding as ASCII avoids
+    a charset scan over multi-megabyte payloads.
+    """
+    return f"data:{mime};base64,{binascii.b2a_base64(data, newline=False).decode('ascii')}"
+
+
+def _persist_generated_image(filename: str, data: bytes) -> str:
+    """Write a generated image under ./generated-img, creating the dir once.
+
+    Runs on the executor from the request path; the makedirs call is skipped
+    once the directory is known to exist.
+    """
+    out_dir = str(_OUT_DIR)
+    if out_dir not in _MEDIA_DIRS:
+        os.makedirs(out_dir, exist_ok=True)
+        _MEDIA_DIRS.add(out_dir)
+    out_path = _OUT_DIR / filename
+    out_path.write_bytes(data)
+    return str(out_path)
+
+
 class AgentService:
     """Service for AI agent-based image generation workflows and asset management."""
 
     def __init__(self, repository: AgentRepository):
         self.repository = repository
 
+    @staticmethod
+    def _invalidate_resolve_cache(user_id: uuid.UUID) -> None:
+        """Drop cached resolutions for a user after a write to their assets."""
+        stale = [key for key in _RESOLVE_CACHE if key[0] == user_id]
+        for key in stale:
+            _RESOLVE_CACHE.pop(key, None)
+        _ASSET_GENERATION[user_id] = _ASSET_GENERATION.get(user_id, 0) + 1
+
+    @staticmethod
+    def asset_generation(user_id: uuid.UUID) -> int:
+        """Current write generation for a user's assets."""
+        return _ASSET_GENERATION.get(user_id, 0)
+
     # ===== Utility Methods =====
 
+    _EXTENSION_MAP: ClassVar[dict[str, str]] = {
+        ImageMimeType.JPEG.value: ".jpg",
+        "image/jpg": ".jpg",
+        ImageMimeType.PNG.value: ".png",
+        "image/webp": ".webp",
+    }
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extension_for(content_type: str) -> str:
+        """Resolve a file extension for a MIME type, memoized per type.
+
+        The common image types are answered from a static map; anything else
+        falls through to mimetypes.guess_extension exactly once per type.
+        """
+        known = AgentService._EXTENSION_MAP.get(content_type)
+        if known:
+            return known
+        guessed = guess_extension(content_type)
+        return guessed.lower() if guessed else ""
+
     @staticmethod
     def generate_storage_filename(
         original_filename: str | None,
         content_type: str | None,
     ) -> str:
         """Create a unique filename preserving a sensible extension."""
-        from app.utils.models import ImageMimeType
-
         suffix = ""
         if original_filename:
             suffix = Path(original_filename).suffix.lower()
 
         if not suffix and content_type:
-            # Map MIME types to extensions
-            if content_type in (ImageMimeType.JPEG.value, "image/jpg"):
-                suffix = ".jpg"
-            elif content_type == ImageMimeType.PNG.value:
-                suffix = ".png"
-            elif content_type == "image/webp":
-                suffix = ".webp"
-            else:
-                guessed = guess_extension(content_type)
-                if guessed:
-                    suffix = guessed.lower()
+            suffix = AgentService._extension_for(content_type)
 
         if suffix and not suffix.startswith("."):
             suffix = f".{suffix.lstrip('.')}"
@@ -76,7 +176,9 @@ class AgentService:
         if not suffix:
             suffix = ".bin"
 
-        return f"{uuid.uuid4().hex}{suffix}"
+        # Storage names only need uniqueness, not UUID semantics; raw urandom
+        # hex skips the uuid formatting layer.
+        return f"{os.urandom(12).hex()}{suffix}"
 
     # ===== Asset Management Methods =====
 
@@ -86,13 +188,15 @@ class AgentService:
         asset_id: uuid.UUID | None = None,
         user_id: uuid.UUID,
         filename: str,
-        data: bytes,
+        data: bytes | BinaryIO,
+        size: int | None = None,
         content_type: str | None = None,
         mime_type: str | None = None,
         session_id: str | None = None,
         prompt: str | None = None,
         source_model_ids: list[uuid.UUID] | None = None,
         source_style_id: uuid.UUID | None = None,
+        commit: bool = True,
     ) -> Asset:
         """Upload media to MinIO and create database record."""
         resolved_content_type = content_type or mime_type or "application/octet-stream"
@@ -103,6 +207,7 @@ class AgentService:
             filename=filename,
             data=data,
             content_type=resolved_content_type,
+            size=size,
         )
 
         if not object_path and settings.minio_enabled:
@@ -112,7 +217,7 @@ class AgentService:
         resolved_path = object_path or filename
 
         # Create database record
-        asset = self.repository.create_asset(
+        asset = await self.repository.create_asset(
             asset_id=asset_id,
             object_path=resolved_path,
             bucket_name=settings.MINIO_BUCKET_NAME,
@@ -123,8 +228,10 @@ class AgentService:
             prompt=prompt,
             source_model_ids=source_model_ids,
             source_style_id=source_style_id,
+            commit=commit,
         )
 
+        self._invalidate_resolve_cache(user_id)
         return asset
 
     async def upload_and_track_model(
@@ -133,8 +240,10 @@ class AgentService:
         asset_id: uuid.UUID | None = None,
         user_id: uuid.UUID,
         filename: str,
-        data: bytes,
+        data: bytes | BinaryIO,
         content_type: str,
+        size: int | None = None,
+        commit: bool = True,
     ) -> Asset:
         """Upload model reference asset to MinIO and create database record."""
         # Upload to MinIO
@@ -142,6 +251,7 @@ class AgentService:
             filename=filename,
             data=data,
             content_type=content_type,
+            size=size,
         )
 
         if not object_path and settings.minio_enabled:
@@ -150,15 +260,17 @@ class AgentService:
         resolved_path = object_path or filename
 
         # Create database record
-        asset = self.repository.create_asset(
+        asset = await self.repository.create_asset(
             asset_id=asset_id,
             object_path=resolved_path,
             bucket_name=settings.MINIO_BUCKET_NAME,
             filename=filename,
             asset_type=AssetType.MODEL,
             user_id=user_id,
+            commit=commit,
         )
 
+        self._invalidate_resolve_cache(user_id)
         return asset
 
     async def upload_and_track_style(
@@ -167,9 +279,11 @@ class AgentService:
         asset_id: uuid.UUID | None = None,
         user_id: uuid.UUID,
         filename: str,
-        data: bytes,
+        data: bytes | BinaryIO,
         content_type: str,
         style_subcategory: str,
+        size: int | None = None,
+        commit: bool = True,
     ) -> Asset:
         """Upload style asset to MinIO and create database record."""
         # Upload to MinIO
@@ -178,6 +292,7 @@ class AgentService:
             filename=filename,
             data=data,
             content_type=content_type,
+            size=size,
         )
 
         if not object_path and settings.minio_enabled:
@@ -186,17 +301,23 @@ class AgentService:
         resolved_path = object_path or filename
 
         # Create database record
-        asset = self.repository.create_asset(
+        asset = await self.repository.create_asset(
             asset_id=asset_id,
             object_path=resolved_path,
             bucket_name=settings.MINIO_BUCKET_NAME,
             filename=filename,
             asset_type=AssetType.STYLE,
             user_id=user_id,
+            commit=commit,
         )
 
+        self._invalidate_resolve_cache(user_id)
         return asset
 
+    async def commit_pending_assets(self) -> None:
+        """Commit asset records staged with commit=False in one transaction."""
+        await self.repository.commit_pending()
+
     async def fetch_asset_bytes(self, asset: Asset) -> bytes:
         """Retrieve raw bytes for an asset, preferring MinIO storage."""
 
@@ -206,91 +327,136 @@ class AgentService:
                 return data
 
         if asset.asset_type == AssetType.MEDIA:
-            local_path = Path.cwd() / "generated-img" / asset.filename
+            local_path = _OUT_DIR / asset.filename
+            cache_key = str(local_path)
+            cached = _LOCAL_BYTES_CACHE.get(cache_key)
+            if cached is not None:
+                _LOCAL_BYTES_CACHE.move_to_end(cache_key)
+                return cached
             if local_path.exists():
-                return local_path.read_bytes()
+                data = local_path.read_bytes()
+                if len(data) <= _LOCAL_BYTES_MAX_ENTRY:
+                    _LOCAL_BYTES_CACHE[cache_key] = data
+                    if len(_LOCAL_BYTES_CACHE) > _LOCAL_BYTES_CACHE_MAX:
+                        _LOCAL_BYTES_CACHE.popitem(last=False)
+                return data
 
         raise FileNotFoundError(
             f"Unable to locate stored bytes for asset {asset.id}"
         )
 
-    def get_user_assets(
+    async def open_asset_stream(self, asset: Asset) -> AsyncIterator[bytes]:
+        """Stream an asset's bytes in chunks, preferring MinIO storage.
+
+        Keeps peak memory at one chunk per in-flight download instead of the
+        full object. Falls back to fetch_asset_bytes when the object is not
+        available in MinIO.
+        """
+        if asset.object_path and settings.minio_enabled:
+            try:
+                async for chunk in stream_object_by_path(asset.object_path):
+                    yield chunk
+            except FileNotFoundError:
+                pass
+            else:
+                return
+
+        if asset.asset_type == AssetType.MEDIA:
+            local_path = _OUT_DIR / asset.filename
+            if local_path.exists():
+                with local_path.open("rb") as handle:
+                    while chunk := await asyncio.to_thread(handle.read, 64 * 1024):
+                        yield chunk
+                return
+
+        yield await self.fetch_asset_bytes(asset)
+
+    async def get_user_assets(
         self,
         *,
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
         asset_type: AssetType | None = None,
-    ) -> list[Asset]:
-        """Retrieve user assets optionally filtered by type."""
-        return self.repository.list_user_assets(
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
+        """Retrieve user assets optionally filtered by type, with the total count."""
+        return await self.repository.list_user_assets(
             user_id=user_id,
             asset_type=asset_type,
             limit=limit,
             offset=skip,
+            created_before=created_before,
         )
 
-    def get_user_media(
+    async def get_user_media(
         self,
         *,
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[Asset]:
-        """Retrieve media assets for a user."""
-        return self.get_user_assets(
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
+        """Retrieve media assets for a user, with the total count."""
+        return await self.get_user_assets(
             user_id=user_id,
             skip=skip,
             limit=limit,
             asset_type=AssetType.MEDIA,
+            created_before=created_before,
         )
 
-    def get_session_assets(
+    async def get_session_assets(
         self, session_id: str, user_id: uuid.UUID | None = None
     ) -> list[Asset]:
         """Retrieve all assets associated with a session."""
-        return self.repository.list_assets_by_session(
+        return await self.repository.list_assets_by_session(
             session_id=session_id, user_id=user_id
         )
 
-    def get_style_assets(
+    async def get_style_assets(
         self,
         *,
         style_subcategory: str | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[Asset]:
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
         """Retrieve style assets, optionally filtered by subcategory."""
-        return self.repository.list_style_assets(
+        return await self.repository.list_style_assets(
             style_subcategory=style_subcategory,
             limit=limit,
             offset=skip,
+            created_before=created_before,
         )
 
-    def get_model_assets(
+    async def get_model_assets(
         self,
         *,
         user_id: uuid.UUID | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[Asset]:
-        """Retrieve model reference assets."""
+        created_before: datetime | None = None,
+    ) -> tuple[list[Asset], int]:
+        """Retrieve model reference assets, with the total count."""
         if user_id is not None:
-            return self.get_user_assets(
+            return await self.get_user_assets(
                 user_id=user_id,
                 skip=skip,
                 limit=limit,
                 asset_type=AssetType.MODEL,
+                created_before=created_before,
             )
-        return self.repository.list_model_assets(
+        return await self.repository.list_model_assets(
             limit=limit,
             offset=skip,
             user_id=None,
+            created_before=created_before,
         )
 
-    def get_asset_for_user(self, asset_id: uuid.UUID, user_id: uuid.UUID) -> Asset | None:
+    async def get_asset_for_user(self, asset_id: uuid.UUID, user_id: uuid.UUID) -> Asset | None:
         """Retrieve an asset if it belongs to the user and is active."""
-        asset = self.repository.get_asset_by_id(asset_id)
+        asset = await self.repository.get_asset_by_id(asset_id)
         if not asset:
             return None
 
@@ -313,21 +479,33 @@ class AgentService:
         """
         
         asset_ids = [token for token in re.split(r"[\s,]+", model_asset_ids) if token]
-        loaded_assets = []
-        
-        for asset_id in asset_ids:
-            asset_uuid = uuid.UUID(asset_id)  # Let ValueError propagate
-            asset = self.get_asset_for_user(asset_uuid, user_id)
-            
-            if not asset:
-                raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
-            
-            blob = await self.fetch_asset_bytes(asset)
-            loaded_assets.append((blob, "application/octet-stream"))
-        
-        return loaded_assets
+        asset_uuids = [uuid.UUID(token) for token in asset_ids]  # Let ValueError propagate
+
+        # One IN-query resolves the whole batch instead of a point lookup per id.
+        found = {
+            asset.id: asset
+            for asset in await self.repository.get_assets_by_ids(asset_uuids, user_id)
+        }
+        for token, asset_uuid in zip(asset_ids, asset_uuids):
+            if asset_uuid not in found:
+                raise HTTPException(status_code=404, detail=f"Asset {token} not found")
+
+        # Fetch the blobs concurrently; the semaphore keeps the fan-out from
+        # overwhelming MinIO on large batches.
+        fetch_semaphore = asyncio.Semaphore(8)
 
-    def resolve_asset_by_identifier(
+        async def _fetch_one(asset: Asset) -> bytes:
+            async with fetch_semaphore:
+                return await self.fetch_asset_bytes(asset)
+
+        blobs = await asyncio.gather(
+            *(_fetch_one(found[asset_uuid]) for asset_uuid in asset_uuids)
+        )
+        # Sniff the real image MIME type; Gemini rejects inline image parts
+        # tagged with a non-image placeholder.
+        return [(blob, detect_image_mime(blob)) for blob in blobs]
+
+    async def resolve_asset_by_identifier(
         self,
         identifier: str,
         user_id: uuid.UUID,
@@ -339,18 +517,37 @@ class AgentService:
         - Exact filename or object_path match
         - Partial filename match (with extension guessing)
         - Partial path match
+
+        Results are cached in-process for a short TTL so bursts of requests
+        for the same asset hit the database once.
         """
-        return self.repository.resolve_asset_by_identifier(identifier, user_id)
+        key = (user_id, identifier)
+        cached = _RESOLVE_CACHE.get(key)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+
+        asset = await self.repository.resolve_asset_by_identifier(identifier, user_id)
+        if asset is not None:
+            if len(_RESOLVE_CACHE) >= _RESOLVE_CACHE_MAX:
+                _RESOLVE_CACHE.clear()
+            _RESOLVE_CACHE[key] = (now + _RESOLVE_CACHE_TTL, asset)
+        else:
+            _RESOLVE_CACHE.pop(key, None)
+        return asset
 
-    def delete_asset(self, asset_id: uuid.UUID) -> Asset | None:
+    async def delete_asset(self, asset_id: uuid.UUID) -> Asset | None:
         """Soft delete an asset."""
-        return self.repository.soft_delete_asset(asset_id)
+        asset = await self.repository.soft_delete_asset(asset_id)
+        if asset is not None:
+            self._invalidate_resolve_cache(asset.user_id)
+        return asset
 
-    def toggle_asset_visibility(
+    async def toggle_asset_visibility(
         self, asset_id: uuid.UUID, is_public: bool
     ) -> Asset | None:
         """Update asset public visibility."""
-        return self.repository.update_asset_visibility(asset_id, is_public)
+        return await self.repository.update_asset_visibility(asset_id, is_public)
 
     # ===== Image Generation Methods =====
 
@@ -359,6 +556,8 @@ class AgentService:
         *,
         request: ImageRequest,
         user_id: uuid.UUID,
+        inline: bool = True,
+        background: BackgroundTasks | None = None,
     ) -> ImageResponse:
         """
         Generate an image using AI agents and store the result.
@@ -372,12 +571,18 @@ class AgentService:
         """
         session_id = request.session_id or str(uuid.uuid4())
 
-        # Initialize or retrieve session
-        session = await ensure_session_exists(str(user_id), session_id)
+        # Session init and payload preparation are independent; overlap them
+        # instead of paying the two latencies back to back.
+        session, file_payloads = await asyncio.gather(
+            ensure_session_exists(str(user_id), session_id),
+            prepare_upload_payloads(request.files),
+        )
         session_id = session.id
 
-        # Prepare uploaded files
-        file_payloads = await prepare_upload_payloads(request.files)
+        # Pre-loaded model blobs join the payloads as-is without another
+        # decode round trip.
+        if request.extra_blobs:
+            file_payloads.extend(request.extra_blobs)
 
         # Get input prompt and category
         input_prompt, category, normalized_style = get_input_prompt_and_category(
@@ -387,8 +592,12 @@ class AgentService:
         output_format = ImageMimeType.PNG
         aspect_ratio = request.aspect_ratio
 
-        # Create session title
-        session_title = (input_prompt or "Image request")[:200]
+        # Create session title only when the session does not already carry
+        # one; passing None leaves the existing title untouched and skips the
+        # state_delta write on repeat turns.
+        session_title = None
+        if not session.state.get("title"):
+            session_title = (input_prompt or "Image request")[:200]
 
         # Start session turn
         session = await start_session_turn(session, title=session_title)
@@ -404,18 +613,14 @@ class AgentService:
         }
 
         # Build agent input text
-        text_for_agent = "\n\n".join(
-            filter(
-                None,
-                [
-                    *(
-                        f"ImageCategory: {category.value}" if category else [],
-                        f"Style: {normalized_style}" if normalized_style else [],
-                    ),
-                    input_prompt.strip() if input_prompt else None,
-                ],
-            )
-        )
+        agent_text_parts: list[str] = []
+        if category:
+            agent_text_parts.append(f"ImageCategory: {category.value}")
+        if normalized_style:
+            agent_text_parts.append(f"Style: {normalized_style}")
+        if input_prompt and (stripped_prompt := input_prompt.strip()):
+            agent_text_parts.append(stripped_prompt)
+        text_for_agent = "\n\n".join(agent_text_parts)
 
         # Log user event
         session = await append_session_event(
@@ -428,20 +633,41 @@ class AgentService:
         try:
             # Templates use the prompt as-is; other categories go through agent refinement
             prompt = input_prompt.strip()
-            
-            if category != ImageCategory.TEMPLATE:
-                await run_root_agent(str(user_id), session_id, text_for_agent)
-                prompt = (
-                    await fetch_prompt(str(user_id), session_id, input_prompt)
-                ).strip()
-
-            # Generate image
-            final_bytes = await generate_image_bytes(
-                file_payloads=file_payloads,
-                prompt=prompt,
-                aspect_ratio=aspect_ratio,
-                output_format=output_format,
-            )
+
+            async with _GEN_SEMAPHORE:
+                if category != ImageCategory.TEMPLATE:
+                    # Uploaded reference images steer refinement, so identical
+                    # prompts with different inputs must not share an entry.
+                    file_digest = hashlib.blake2b(digest_size=16)
+                    for payload_bytes, _ in file_payloads:
+                        file_digest.update(payload_bytes)
+                    refine_key = _refinement_cache_key(
+                        category.value if category else None,
+                        normalized_style,
+                        request.aspect_ratio.value if request.aspect_ratio else None,
+                        prompt,
+                        file_digest.hexdigest(),
+                    )
+                    cached_prompt = _REFINED_PROMPT_CACHE.get(refine_key)
+                    if cached_prompt is not None:
+                        _REFINED_PROMPT_CACHE.move_to_end(refine_key)
+                        prompt = cached_prompt
+                    else:
+                        await run_root_agent(str(user_id), session_id, text_for_agent)
+                        prompt = (
+                            await fetch_prompt(str(user_id), session_id, input_prompt)
+                        ).strip()
+                        _REFINED_PROMPT_CACHE[refine_key] = prompt
+                        if len(_REFINED_PROMPT_CACHE) > _REFINED_PROMPT_CACHE_MAX:
+                            _REFINED_PROMPT_CACHE.popitem(last=False)
+
+                # Generate image
+                final_bytes = await generate_image_bytes(
+                    file_payloads=file_payloads,
+                    prompt=prompt,
+                    aspect_ratio=aspect_ratio,
+                    output_format=output_format,
+                )
 
         except asyncio.CancelledError:
             session = await finish_session_turn(
@@ -449,17 +675,8 @@ class AgentService:
                 status=ImageStatus.FAILED,
                 title=session_title,
                 interrupted=True,
-            )
-            await append_session_event(
-                session,
-                author=SYSTEM_AGENT_AUTHOR,
-                text="Image generation cancelled by user",
-                custom_metadata={
-                    "status": ImageStatus.FAILED.value,
-                    "reason": "cancelled_by_user",
-                },
-                turn_complete=True,
-                interrupted=True,
+                completion_text="Image generation cancelled by user",
+                completion_metadata={"reason": "cancelled_by_user"},
             )
             raise
 
@@ -468,31 +685,20 @@ class AgentService:
                 session,
                 status=ImageStatus.FAILED,
                 title=session_title,
-            )
-            await append_session_event(
-                session,
-                author=SYSTEM_AGENT_AUTHOR,
-                text=f"Image generation failed: {exc}",
-                custom_metadata={"status": ImageStatus.FAILED.value},
-                turn_complete=True,
+                completion_text=f"Image generation failed: {exc}",
             )
             raise
 
-        else:
-            session = await finish_session_turn(
-                session,
-                status=ImageStatus.COMPLETED,
-                title=session_title,
-            )
-
-        # Save locally (for development/debugging)
+        # Save locally (for development/debugging); the response does not
+        # depend on the debug copy, so defer it past the response when the
+        # route provides a background-task queue.
         asset_id = uuid.uuid4()
-        filename = f"{asset_id}.{output_format.name.lower()}"
-        out_dir = os.path.join(os.getcwd(), "generated-img")
-        os.makedirs(out_dir, exist_ok=True)
-        out_path = os.path.join(out_dir, filename)
-        with open(out_path, "wb") as f:
-            f.write(final_bytes)
+        filename = f"{asset_id}.{output_format.extension}"
+        if settings.DEBUG_SAVE_LOCAL:
+            if background is not None:
+                background.add_task(_persist_generated_image, filename, final_bytes)
+            else:
+                await asyncio.to_thread(_persist_generated_image, filename, final_bytes)
 
         # Upload and track asset using merged methods
         asset = await self.upload_and_track_media(
@@ -505,22 +711,40 @@ class AgentService:
             prompt=prompt,
         )
 
-        # Log completion event
-        session = await append_session_event(
+        # Close the turn and log completion in one event instead of two.
+        session = await finish_session_turn(
             session,
-            author=SYSTEM_AGENT_AUTHOR,
-            text="Image generation completed",
-            custom_metadata={
-                "status": ImageStatus.COMPLETED.value,
+            status=ImageStatus.COMPLETED,
+            title=session_title,
+            completion_text="Image generation completed",
+            completion_metadata={
                 "output_path": filename,
                 "asset_id": str(asset.id),
                 "media_object": asset.object_path,
             },
-            turn_complete=True,
         )
 
-        # Encode image for response
-        encoded_image = f"data:{output_format.value};base64,{base64.b64encode(final_bytes).decode()}"
+        # Prefer a presigned storage URL when enabled: the client pulls the
+        # image straight from MinIO and the API tier never proxies the bytes.
+        output_url = f"{settings.API_V1_STR}/agent/media/{asset.id}/download"
+        if settings.PRESIGNED_MEDIA_URLS and asset.object_path:
+            presigned = await presign_get_by_path(
+                asset.object_path,
+                expiry_seconds=settings.PRESIGNED_URL_EXPIRY_SECONDS,
+            )
+            if presigned:
+                output_url = presigned
+
+        # Encode image for response only when the caller wants it inline;
+        # otherwise media_object_path is the reference and the client fetches
+        # via the download endpoint, skipping the base64 blow-up entirely.
+        encoded_image = None
+        if inline:
+            # Encoding multi-MB images is CPU-bound; run it on the executor so
+            # the event loop keeps serving other requests meanwhile.
+            encoded_image = await asyncio.to_thread(
+                _encode_data_url, output_format.value, final_bytes
+            )
 
         return ImageResponse(
             status=ImageStatus.COMPLETED if prompt else ImageStatus.PENDING,
@@ -531,5 +755,6 @@ class AgentService:
             category=category.value if category else None,
             user_id=str(user_id),
             output_file=encoded_image,
+            output_url=output_url,
             media_object_path=asset.object_path,
         )
@@ -8,75 +8,112 @@ import uuid
 from datetime import date, timedelta
 from typing import Any
 
-from sqlmodel import Session, func, or_, select, update
+from sqlmodel import func, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.utils.config import settings
 from app.utils.models import User, UserCreate, UserUpdate
 from app.utils.security import get_password_hash, verify_password
 
 class UserRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def create_user(self, user_create: UserCreate) -> User:
+    async def create_user(self, user_create: UserCreate) -> User:
         db_obj = User.model_validate(
             user_create,
             update={"password_hash": get_password_hash(user_create.password)},
         )
         self.session.add(db_obj)
-        self.session.commit()
-        self.session.refresh(db_obj)
+        await self.session.commit()
+        await self.session.refresh(db_obj)
         return db_obj
 
-    def is_email_taken(
+    async def is_email_taken(
         self, email: str, exclude_user_id: uuid.UUID | None = None
     ) -> bool:
         query = select(User).where(User.email == email)
         if exclude_user_id:
             query = query.where(User.id != exclude_user_id)
-        return self.session.exec(query).first() is not None
+        return (await self.session.exec(query)).first() is not None
 
-    def is_account_taken(
+    async def is_account_taken(
         self, account: str, exclude_user_id: uuid.UUID | None = None
     ) -> bool:
         query = select(User).where(User.account == account)
         if exclude_user_id:
             query = query.where(User.id != exclude_user_id)
-        return self.session.exec(query).first() is not None
+        return (await self.session.exec(query)).first() is not None
+
+    async def find_conflicts(
+        self,
+        email: str | None = None,
+        account: str | None = None,
+        exclude_user_id: uuid.UUID | None = None,
+    ) -> set[str]:
+        """Return which unique fields ("email", "account") are already taken.
+
+        Checks both fields with a single OR query instead of one SELECT per
+        field.
+        """
+        conditions = []
+        if email:
+            conditions.append(User.email == email)
+        if account:
+            conditions.append(User.account == account)
+        if not conditions:
+            return set()
+
+        query = select(User.email, User.account).where(or_(*conditions))
+        if exclude_user_id:
+            query = query.where(User.id != exclude_user_id)
 
-    def authenticate(self, email: str, password: str) -> User | None:
-        db_user = self.get_user_by_email(email)
+        conflicts: set[str] = set()
+        for row_email, row_account in (await self.session.exec(query)).all():
+            if email and row_email == email:
+                conflicts.add("email")
+            if account and row_account == account:
+                conflicts.add("account")
+        return conflicts
+
+    async def authenticate(self, email: str, password: str) -> User | None:
+        db_user = await self.get_user_by_email(email)
         if not db_user:
             return None
         if not verify_password(password, db_user.password_hash):
             return None
         return db_user
 
-    def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
-        return self.session.get(User, user_id)
+    async def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
+        return await self.session.get(User, user_id)
 
-    def get_user_by_email(self, email: str) -> User | None:
+    async def get_user_by_email(self, email: str) -> User | None:
         query = select(User).where(User.email == email)
         # self.explain_analyze(query)
-        return self.session.exec(query).first()
+        return (await self.session.exec(query)).first()
 
-    def get_user_by_account(self, account: str) -> User | None:
+    async def get_user_by_account(self, account: str) -> User | None:
         query = select(User).where(User.account == account)
         # self.explain_analyze(query)
-        return self.session.exec(query).first()
-
-    def get_users(self, skip: int = 0, limit: int = 100) -> tuple[list[User], int]:
-        count_query = select(func.count()).select_from(User)
-        # self.explain_analyze(count_query)
-        total_count = self.session.exec(count_query).one()
+        return (await self.session.exec(query)).first()
 
-        query = select(User).offset(skip).limit(limit)
+    async def get_users(
+        self, skip: int = 0, limit: int = 100
+    ) -> tuple[list[User], int]:
+        # count(*) window in the page query: one round-trip returns both the
+        # page and the total.
+        query = (
+            select(User, func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+        )
         # self.explain_analyze(query)
-        users = self.session.exec(query).all()
+        rows = (await self.session.exec(query)).all()
+        if not rows:
+            return [], 0
+        return [user for user, _ in rows], rows[0][1]
 
-        return users, total_count
-
-    def update_user(self, db_user: User, user_in: UserUpdate) -> Any:
+    async def update_user(self, db_user: User, user_in: UserUpdate) -> Any:
         user_data = user_in.model_dump(exclude_unset=True)
         extra_data = {}
         if "password" in user_data:
@@ -85,18 +122,18 @@ class UserRepository:
             extra_data["password_hash"] = password_hash
         db_user.sqlmodel_update(user_data, update=extra_data)
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        await self.session.commit()
+        await self.session.refresh(db_user)
         return db_user
 
-    def update_user_password(self, db_user: User, password_hash: str) -> User:
+    async def update_user_password(self, db_user: User, password_hash: str) -> User:
         db_user.password_hash = password_hash
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        await self.session.commit()
+        await self.session.refresh(db_user)
         return db_user
 
-    def search_users(
+    async def search_users(
         self, query: str, skip: int = 0, limit: int = 20
     ) -> tuple[list[User], int]:
         search_filter = or_(
@@ -105,48 +142,45 @@ class UserRepository:
             User.email.ilike(f"%{query}%"),
         )
 
-        count_query = select(func.count()).select_from(User).where(search_filter)
-        # self.explain_analyze(count_query)
-        total_count = self.session.exec(count_query).one()
-
-        user_query = select(User).where(search_filter).offset(skip).limit(limit)
+        user_query = (
+            select(User, func.count().over().label("total"))
+            .where(search_filter)
+            .offset(skip)
+            .limit(limit)
+        )
         # self.explain_analyze(user_query)
-        users = self.session.exec(user_query).all()
-
-        return users, total_count
-
-    def soft_delete_user(self, user_id: uuid.UUID) -> bool:
-        user = self.get_user_by_id(user_id)
-        if not user:
-            return False
+        rows = (await self.session.exec(user_query)).all()
+        if not rows:
+            return [], 0
+        return [user for user, _ in rows], rows[0][1]
 
+    async def soft_delete_user(self, user_id: uuid.UUID) -> bool:
         deletion_date = date.today() + timedelta(
             days=settings.USER_DELETION_GRACE_PERIOD_DAYS
         )
 
+        # Single UPDATE ... RETURNING: the WHERE clause carries the
+        # precondition, so no prior SELECT (and no read-modify-write race).
         query = (
             update(User)
-            .where(User.id == user_id)
+            .where(User.id == user_id, User.deleted_at.is_(None))
             .values(deleted_at=deletion_date, is_active=True)
+            .returning(User.id)
         )
         # self.explain_analyze(query)
-        self.session.exec(query)
-        self.session.commit()
-        return True
-
-    def recover_user(self, user_id: uuid.UUID) -> bool:
-        user = self.get_user_by_id(user_id)
-        if not user or user.deleted_at is None:
-            return False
-        if date.today() > user.deleted_at:
-            return False
+        updated = (await self.session.exec(query)).first()
+        await self.session.commit()
+        return updated is not None
 
+    async def recover_user(self, user_id: uuid.UUID) -> bool:
+        # Recoverable only while the grace-period deadline has not passed.
         query = (
             update(User)
-            .where(User.id == user_id)
+            .where(User.id == user_id, User.deleted_at >= date.today())
             .values(deleted_at=None, is_active=True)
+            .returning(User.id)
         )
         # self.explain_analyze(query)
-        self.session.exec(query)
-        self.session.commit()
-        return True
+        updated = (await self.session.exec(query)).first()
+        await self.session.commit()
+        return updated is not None
@@ -16,60 +16,66 @@ class UserService:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    def register_user(self, user_register: UserRegister) -> User:
-        if self.repository.is_email_taken(user_register.email):
+    async def register_user(self, user_register: UserRegister) -> User:
+        conflicts = await self.repository.find_conflicts(
+            email=user_register.email, account=user_register.account
+        )
+        if "email" in conflicts:
             raise ValueError("Email already registered")
 
-        if self.repository.is_account_taken(user_register.account):
+        if "account" in conflicts:
             raise ValueError("Account name already taken")
 
         user_create = UserCreate.model_validate(user_register)
-        return self.repository.create_user(user_create)
+        return await self.repository.create_user(user_create)
 
-    def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
-        return self.repository.get_user_by_id(user_id)
+    async def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
+        return await self.repository.get_user_by_id(user_id)
 
-    def get_user_by_email(self, email: str) -> User | None:
-        return self.repository.get_user_by_email(email)
+    async def get_user_by_email(self, email: str) -> User | None:
+        return await self.repository.get_user_by_email(email)
 
-    def get_user_by_account(self, account: str) -> User | None:
-        return self.repository.get_user_by_account(account)
+    async def get_user_by_account(self, account: str) -> User | None:
+        return await self.repository.get_user_by_account(account)
 
-    def get_users_with_pagination(self, skip: int = 0, limit: int = 100) -> UsersPublic:
-        users, count = self.repository.get_users(skip, limit)
+    async def get_users_with_pagination(
+        self, skip: int = 0, limit: int = 100
+    ) -> UsersPublic:
+        users, count = await self.repository.get_users(skip, limit)
         return UsersPublic(data=users, count=count)
 
-    def update_user(self, user_id: uuid.UUID, user_update: UserUpdate) -> User:
-        user = self.repository.get_user_by_id(user_id)
+    async def update_user(self, user_id: uuid.UUID, user_update: UserUpdate) -> User:
+        user = await self.repository.get_user_by_id(user_id)
         if not user:
             raise ValueError("User not found")
 
-        if user_update.email and self.repository.is_email_taken(
-            user_update.email, exclude_user_id=user_id
-        ):
+        conflicts = await self.repository.find_conflicts(
+            email=user_update.email,
+            account=user_update.account,
+            exclude_user_id=user_id,
+        )
+        if "email" in conflicts:
             raise ValueError("Email already taken by another user")
 
-        if user_update.account and self.repository.is_account_taken(
-            user_update.account, exclude_user_id=user_id
-        ):
+        if "account" in conflicts:
             raise ValueError("Account name already taken by another user")
 
-        return self.repository.update_user(user, user_update)
+        return await self.repository.update_user(user, user_update)
 
-    def authenticate(self, email: str, password: str) -> User | None:
-        return self.repository.authenticate(email, password)
+    async def authenticate(self, email: str, password: str) -> User | None:
+        return await self.repository.authenticate(email, password)
 
-    def is_email_available(
+    async def is_email_available(
         self, email: str, exclude_user_id: uuid.UUID | None = None
     ) -> bool:
-        return not self.repository.is_email_taken(email, exclude_user_id)
+        return not await self.repository.is_email_taken(email, exclude_user_id)
 
-    def is_account_available(
+    async def is_account_available(
         self, account: str, exclude_user_id: uuid.UUID | None = None
     ) -> bool:
-        return not self.repository.is_account_taken(account, exclude_user_id)
+        return not await self.repository.is_account_taken(account, exclude_user_id)
 
-    def update_password(
+    async def update_password(
         self, user: User, current_password: str, new_password: str
     ) -> User:
         if not security.verify_password(current_password, user.password_hash):
@@ -79,21 +85,23 @@ class UserService:
             raise ValueError("New password cannot be the same as the current one")
 
         password_hash = security.get_password_hash(new_password)
-        return self.repository.update_user_password(user, password_hash)
+        return await self.repository.update_user_password(user, password_hash)
 
-    def search_users(self, query: str, skip: int = 0, limit: int = 20) -> UsersPublic:
-        users, count = self.repository.search_users(query, skip, limit)
+    async def search_users(
+        self, query: str, skip: int = 0, limit: int = 20
+    ) -> UsersPublic:
+        users, count = await self.repository.search_users(query, skip, limit)
         return UsersPublic(data=users, count=count)
 
-    def soft_delete_user(self, user_id: uuid.UUID) -> bool:
-        user = self.repository.get_user_by_id(user_id)
+    async def soft_delete_user(self, user_id: uuid.UUID) -> bool:
+        user = await self.repository.get_user_by_id(user_id)
         if not user:
             raise ValueError("User not found")
 
         if user.is_superuser:
             raise ValueError("Superuser accounts cannot be deleted")
 
-        return self.repository.soft_delete_user(user_id)
+        return await self.repository.soft_delete_user(user_id)
 
-    def recover_user(self, user_id: uuid.UUID) -> bool:
-        return self.repository.recover_user(user_id)
+    async def recover_user(self, user_id: uuid.UUID) -> bool:
+        return await self.repository.recover_user(user_id)
@@ -2,11 +2,14 @@
 
 import asyncio
 import logging
+import random
+import re
 import uuid
+from functools import wraps
 from io import BytesIO
 from typing import Any, Optional, cast
 
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile
 from google import genai
 from google.genai.errors import APIError
 from google.genai.types import (
@@ -36,6 +39,75 @@ logger = logging.getLogger(__name__)
 # structured parts we don't need to inspect directly.
 logging.getLogger("google.genai.types").setLevel(logging.ERROR)
 
+# Upstream hiccups that are worth one more try: throttling, quota blips, and
+# gateway-style 5xx responses from the GenAI endpoints.
+_RETRYABLE_ERROR_RE = re.compile(r"rate[ _-]?limit|quota", re.I)
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for transient upstream failures that merit a retry."""
+    if isinstance(exc, APIError) and exc.code in _RETRYABLE_STATUS_CODES:
+        return True
+    return bool(_RETRYABLE_ERROR_RE.search(str(exc)))
+
+
+# Sentinel for with_backoff: distinguishes "no fallback, re-raise" from a
+# caller-supplied fallback of None.
+_RERAISE = object()
+
+
+def with_backoff(
+    max_attempts: int = 3,
+    base: float = 0.5,
+    cap: float = 4.0,
+    fallback: Any = _RERAISE,
+):
+    """Retry an async callable on transient upstream errors with backoff.
+
+    Sleeps min(cap, base * 2**attempt) plus a small jitter between attempts;
+    non-retryable errors propagate unchanged. When retries are exhausted the
+    last error propagates too, unless ``fallback`` is given, in which case it
+    is returned instead — for callers that can degrade gracefully.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    if not _is_retryable(exc):
+                        raise
+                    if attempt == max_attempts - 1:
+                        if fallback is _RERAISE:
+                            raise
+                        logger.warning(
+                            "%s failed after %d attempts with %s; degrading to fallback result",
+                            func.__name__,
+                            max_attempts,
+                            exc,
+                        )
+                        return fallback
+                    delay = min(cap, base * 2**attempt) + random.random() * 0.1
+                    logger.warning(
+                        "%s failed with %s; retrying in %.2fs (attempt %d/%d)",
+                        func.__name__,
+                        exc,
+                        delay,
+                        attempt + 1,
+                        max_attempts,
+                    )
+                    await asyncio.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
 async def ensure_session_exists(user_id: str, session_id: str) -> Session:
     """Return an existing session or create one if absent."""
 
@@ -156,8 +228,15 @@ async def finish_session_turn(
     status: ImageStatus,
     title: str | None = None,
     interrupted: bool | None = None,
+    completion_text: str | None = None,
+    completion_metadata: dict[str, Any] | None = None,
 ) -> Session:
-    """Store the final status for the session turn."""
+    """Store the final status for the session turn.
+
+    Callers can fold their outcome details into this event via
+    completion_text/completion_metadata instead of appending a second one,
+    so closing a turn costs a single append.
+    """
 
     state_delta: dict[str, object] = {"status": status.value}
     if title is not None:
@@ -166,47 +245,75 @@ async def finish_session_turn(
     metadata: dict[str, Any] = {"status": status.value}
     if title is not None:
         metadata["title"] = title
+    if completion_metadata:
+        metadata.update(completion_metadata)
 
     return await append_session_event(
         session,
         author=SYSTEM_AGENT_AUTHOR,
         state_delta=state_delta,
-        text=f"Session turn {status.value.lower()}",
+        text=completion_text or f"Session turn {status.value.lower()}",
         custom_metadata=metadata,
         turn_complete=True,
         interrupted=interrupted,
     )
 
 
+# Chunk size for upload reads; keeps per-file buffering incremental so an
+# oversized upload is rejected before it is fully resident in memory.
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bounds concurrent upload reads so a many-file request does not contend on
+# disk-spooled temp files all at once.
+_PAYLOAD_SEMAPHORE = asyncio.Semaphore(4)
+
+
+def detect_image_mime(data: bytes, fallback: str | None = None) -> str:
+    """Sniff the MIME type of raw image bytes via PIL.
+
+    Falls back to ``fallback`` (or PNG) when the format cannot be determined.
+    """
+    try:
+        with Image.open(BytesIO(data)) as img:
+            image_format = img.format
+    except Exception:
+        image_format = None
+    return Image.MIME.get(image_format, fallback or ImageMimeType.PNG.value)
+
+
 async def prepare_upload_payloads(files: list[UploadFile]) -> list[tuple[bytes, str]]:
     """Convert uploaded files into (bytes, mime_type) tuples for processing.
-    
+
+    Files are read concurrently in bounded chunks and rejected with a 413 as
+    soon as one exceeds the per-file limit, instead of slurping every upload
+    whole before validating.
+
     Args:
         files: List of uploaded file objects
-        
+
     Returns:
         List of (image_bytes, mime_type) tuples
     """
-    payloads = []
-    
-    for upload_file in files:
-        # Read file data
-        file_bytes = await upload_file.read()
-        await upload_file.seek(0)  # Reset file pointer
 
-        # Detect image format using PIL
-        with Image.open(BytesIO(file_bytes)) as img:
-            image_format = img.format
+    async def _read_one(upload_file: UploadFile) -> tuple[bytes, str]:
+        async with _PAYLOAD_SEMAPHORE:
+            buffer = bytearray()
+            while chunk := await upload_file.read(_UPLOAD_CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) > settings.MAX_UPLOAD_FILE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File {upload_file.filename} exceeds the upload size limit",
+                    )
+            await upload_file.seek(0)  # Reset file pointer
+            file_bytes = bytes(buffer)
 
-        # Get MIME type from PIL's mapping or fall back to content_type
-        mime_type = Image.MIME.get(
-            image_format, 
-            upload_file.content_type or ImageMimeType.PNG.value
-        )
-        
-        payloads.append((file_bytes, mime_type))
+        # Detect image format using PIL, falling back to the declared
+        # content_type when the bytes cannot be identified
+        mime_type = detect_image_mime(file_bytes, fallback=upload_file.content_type)
+        return file_bytes, mime_type
 
-    return payloads
+    return list(await asyncio.gather(*(_read_one(f) for f in files)))
 
 
 def get_input_prompt_and_category(
@@ -253,6 +360,7 @@ def get_input_prompt_and_category(
     input_prompt = user_prompt or style_prompt or ""
     return input_prompt, category, normalized_style
 
+@with_backoff(max_attempts=3, base=0.5, cap=4.0)
 async def generate_image_bytes(
     file_payloads: list[tuple[bytes, str]],
     prompt: str,
@@ -351,6 +459,10 @@ async def fetch_prompt(
     return fallback_prompt
 
 
+# fallback=None: if retries are exhausted the run resolves to None and
+# fetch_prompt degrades to the unrefined input prompt, as in the
+# pre-retry behavior — a quota outage should not fail the whole request.
+@with_backoff(max_attempts=3, base=0.5, cap=4.0, fallback=None)
 async def run_root_agent(
     user_id: str,
     session_id: str,
@@ -406,6 +518,10 @@ async def run_root_agent(
                 break
 
     except APIError as exc:
+        # Let transient errors escape so with_backoff can retry the run;
+        # everything else degrades to the unrefined fallback prompt as before.
+        if _is_retryable(exc):
+            raise
         logger.warning("Gemini agent run failed: %s", exc)
         return None
 
@@ -151,10 +151,42 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str | None = None
     GOOGLE_AGENT_NAME: str = "image_app"
 
+    # OpenAI-compatible endpoint (Ollama or a proxy) for the chat LLM adapter
+    OPENAI_BASE_URL: str = "http://localhost:11434/v1"
+    OPENAI_API_KEY: str = "ollama"
+
     GOOGLE_GENAI_CLIENT: ClassVar[genai.Client | None] = None
     
     GOOGLE_BANANA_MODEL_SESSION: ClassVar[DatabaseSessionService | None] = None
 
+    # Default-executor size for asyncio.to_thread offloads (MinIO I/O, image
+    # encoding); the asyncio default caps concurrency well below what the
+    # upload fan-out can drive.
+    THREAD_POOL_SIZE: int = 64
+
+    # Cap on concurrent agent refinement + image generation calls per worker;
+    # spikes queue on the app-side semaphore instead of driving upstream 429s.
+    MAX_CONCURRENT_IMAGE_GENS: int = 4
+
+    # Upload limits
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024  # per-request body cap (50 MB)
+    MAX_UPLOAD_FILE_BYTES: int = 20 * 1024 * 1024  # per-file cap (20 MB)
+
+    # When enabled, generation responses carry a presigned MinIO GET URL so
+    # clients download images straight from object storage instead of
+    # proxying through the API tier.
+    PRESIGNED_MEDIA_URLS: bool = False
+    PRESIGNED_URL_EXPIRY_SECONDS: int = 3600
+
+    # Keep a local debug copy of generated images under ./generated-img;
+    # disable in deployments where MinIO is the only store that matters.
+    DEBUG_SAVE_LOCAL: bool = True
+
+    # Image types accepted by the generation route (not a Pydantic field)
+    ALLOWED_IMAGE_MIME_TYPES: ClassVar[frozenset[str]] = frozenset(
+        {"image/png", "image/jpeg", "image/webp"}
+    )
+
     # MinIO Configuration
     MINIO_ENDPOINT: str | None = None
     MINIO_ACCESS_KEY: str | None = None
@@ -7,7 +7,7 @@ organized by functional area for better maintainability.
 import uuid
 from datetime import UTC, date, datetime
 from enum import Enum
-from typing import Annotated, Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from fastapi import UploadFile
 from pydantic import BaseModel, BeforeValidator, EmailStr, AliasChoices, field_validator
@@ -84,6 +84,16 @@ class ImageMimeType(str, Enum):
     PNG = "image/png"
     JPEG = "image/jpeg"
 
+    @property
+    def extension(self) -> str:
+        """File extension for this format, precomputed per member."""
+        return _IMAGE_MIME_EXTENSIONS[self]
+
+
+# Computed once at import so the per-request filename construction skips the
+# enum name lookup and str.lower call.
+_IMAGE_MIME_EXTENSIONS = {member: member.name.lower() for member in ImageMimeType}
+
 
 class ImageAspectRatio(str, Enum):
     """Supported aspect ratios for image generation.
@@ -349,6 +359,10 @@ class ImageRequest(BaseModel):
         None,
         description="Routing category: 'default', 'template', or 'fit'. Defaults to 'default' when omitted.",
     )
+    extra_blobs: List[Tuple[bytes, str]] = Field(
+        default_factory=list,
+        description="Pre-loaded (bytes, mime_type) payloads, e.g. referenced model assets",
+    )
 
 
 @field_validator("files")
@@ -464,4 +478,5 @@ class ImageResponse(BaseModel):
     category: str | None = None
     user_id: str
     output_file: Optional[str] = None
+    output_url: Optional[str] = None
     media_object_path: Optional[str] = None
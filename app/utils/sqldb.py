@@ -1,21 +1,31 @@
 """Database Initialization
 =======================
-Creates the database engine and initializes the first superuser
+Creates the async database engine and initializes the first superuser
 in the database if not already present.
 """
 
-from sqlmodel import Session, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.services.user.user_repository import UserRepository
 from app.utils.config import settings
 from app.utils.models import UserCreate
 
-engine = create_engine(str(settings.SYNC_DATABASE_URI))
+# Sized pool with pre-ping: bursts reuse warm connections instead of paying
+# connection setup per request, and stale connections are recycled before
+# they surface as errors.
+engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+)
 
 
-def init_db(session: Session) -> None:
+async def init_db(session: AsyncSession) -> None:
     repository = UserRepository(session)
-    user = repository.get_user_by_email(settings.FIRST_SUPERUSER)
+    user = await repository.get_user_by_email(settings.FIRST_SUPERUSER)
     if not user:
         user_in = UserCreate(
             email=settings.FIRST_SUPERUSER,
@@ -24,4 +34,4 @@ def init_db(session: Session) -> None:
             name=settings.FIRST_SUPERUSER_NAME,
             is_superuser=True,
         )
-        user = repository.create_user(user_in)
\ No newline at end of file
+        user = await repository.create_user(user_in)
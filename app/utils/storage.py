@@ -12,9 +12,12 @@ Tagging Strategy:
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections.abc import AsyncIterator
 from io import BytesIO
+from typing import BinaryIO
 
 from minio import Minio
 from minio.commonconfig import Tags
@@ -46,6 +49,66 @@ def _get_minio_client() -> Minio | None:
     return settings.minio_client
 
 
+# Multipart chunk size used when the payload length is unknown.
+_STREAM_PART_SIZE = 10 * 1024 * 1024
+
+
+def _as_put_args(
+    data: bytes | BinaryIO, size: int | None
+) -> tuple[BinaryIO, int, int]:
+    """Normalize payloads into (stream, length, part_size) for put_object.
+
+    Raw bytes are wrapped in BytesIO; file-like objects are streamed as-is so
+    the full payload never has to be materialized in memory. When the length
+    is unknown, MinIO's multipart uploader is used with a fixed part size.
+    """
+    if isinstance(data, bytes | bytearray | memoryview):
+        buf = bytes(data)
+        return BytesIO(buf), len(buf), 0
+    if size is not None:
+        return data, size, 0
+    return data, -1, _STREAM_PART_SIZE
+
+
+_UPLOAD_MAX_ATTEMPTS = 3
+
+
+def _put_with_retry(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    stream: BinaryIO,
+    length: int,
+    part_size: int,
+    content_type: str,
+) -> None:
+    """put_object with exponential backoff on transient S3 errors.
+
+    Runs inside a worker thread, so the blocking sleep is fine. Retries only
+    when the stream can be rewound; otherwise the error propagates after the
+    first attempt.
+    """
+    for attempt in range(_UPLOAD_MAX_ATTEMPTS):
+        try:
+            client.put_object(
+                bucket,
+                object_name,
+                stream,
+                length=length,
+                part_size=part_size,
+                content_type=content_type,
+            )
+            return
+        except S3Error:
+            if attempt == _UPLOAD_MAX_ATTEMPTS - 1 or not stream.seekable():
+                raise
+            logger.warning(
+                "Retrying upload of %s (attempt %d)", object_name, attempt + 2
+            )
+            time.sleep(2**attempt)
+            stream.seek(0)
+
+
 async def ensure_minio_structure() -> None:
     """Ensure the MinIO bucket exists.
     With tagging strategy, we use a flat structure in the bucket.
@@ -80,8 +143,9 @@ async def ensure_minio_structure() -> None:
 async def upload_user_media(
     user_id: str,
     filename: str,
-    data: bytes,
+    data: bytes | BinaryIO,
     content_type: str = "image/png",
+    size: int | None = None,
 ) -> str | None:
     """Upload a user media file (generated image) to MinIO.
     Stores in flat structure: media/{filename}
@@ -90,8 +154,9 @@ async def upload_user_media(
     Args:
         user_id: User ID
         filename: Filename to store
-        data: File bytes
+        data: File bytes or a readable binary stream
         content_type: MIME type
+        size: Stream length when known (ignored for raw bytes)
 
     Returns:
         Object path if successful, None if MinIO is disabled or fails
@@ -106,15 +171,18 @@ async def upload_user_media(
     bucket = settings.MINIO_BUCKET_NAME
     prefix = settings.MINIO_PREFIX_MEDIA.rstrip("/")
     object_name = f"{prefix}/{filename}" if prefix else filename
+    stream, length, part_size = _as_put_args(data, size)
 
     def _upload() -> str:
         try:
-            # Upload object
-            client.put_object(
+            # Upload object (streamed, no intermediate copy)
+            _put_with_retry(
+                client,
                 bucket,
                 object_name,
-                BytesIO(data),
-                length=len(data),
+                stream,
+                length=length,
+                part_size=part_size,
                 content_type=content_type,
             )
 
@@ -136,9 +204,10 @@ async def upload_user_media(
 
 async def upload_model_asset(
     filename: str,
-    data: bytes,
+    data: bytes | BinaryIO,
     content_type: str = "image/png",
     is_static: bool = True,
+    size: int | None = None,
 ) -> str | None:
     """Upload a model reference asset to MinIO.
     Stores in flat structure: models/{filename}
@@ -146,9 +215,10 @@ async def upload_model_asset(
 
     Args:
         filename: Filename to store
-        data: File bytes
+        data: File bytes or a readable binary stream
         content_type: MIME type
         is_static: True for static models, False for user-uploaded custom models
+        size: Stream length when known (ignored for raw bytes)
 
     Returns:
         Object path if successful, None if disabled or fails
@@ -162,15 +232,18 @@ async def upload_model_asset(
     bucket = settings.MINIO_BUCKET_NAME
     prefix = settings.MINIO_PREFIX_MODELS.rstrip("/")
     object_name = f"{prefix}/{filename}" if prefix else filename
+    stream, length, part_size = _as_put_args(data, size)
 
     def _upload() -> str:
         try:
-            # Upload object
-            client.put_object(
+            # Upload object (streamed, no intermediate copy)
+            _put_with_retry(
+                client,
                 bucket,
                 object_name,
-                BytesIO(data),
-                length=len(data),
+                stream,
+                length=length,
+                part_size=part_size,
                 content_type=content_type,
             )
 
@@ -193,8 +266,9 @@ async def upload_model_asset(
 async def upload_style_asset(
     style: str,
     filename: str,
-    data: bytes,
+    data: bytes | BinaryIO,
     content_type: str = "image/png",
+    size: int | None = None,
 ) -> str | None:
     """Upload a style template asset to MinIO.
     Stores in flat structure: styles/{filename}
@@ -203,8 +277,9 @@ async def upload_style_asset(
     Args:
         style: Style subcategory (fit, template, product, or namespaced template groups like styles:* / lightbox:*)
         filename: Filename to store
-        data: File bytes
+        data: File bytes or a readable binary stream
         content_type: MIME type
+        size: Stream length when known (ignored for raw bytes)
 
     Returns:
         Object path if successful, None if disabled or fails
@@ -218,15 +293,18 @@ async def upload_style_asset(
     bucket = settings.MINIO_BUCKET_NAME
     prefix = settings.MINIO_PREFIX_STYLES.rstrip("/")
     object_name = f"{prefix}/{filename}" if prefix else filename
+    stream, length, part_size = _as_put_args(data, size)
 
     def _upload() -> str:
         try:
-            # Upload object
-            client.put_object(
+            # Upload object (streamed, no intermediate copy)
+            _put_with_retry(
+                client,
                 bucket,
                 object_name,
-                BytesIO(data),
-                length=len(data),
+                stream,
+                length=length,
+                part_size=part_size,
                 content_type=content_type,
             )
 
@@ -278,6 +356,105 @@ async def fetch_object_by_path(object_path: str) -> bytes | None:
     return await asyncio.to_thread(_fetch)
 
 
+async def presign_get_by_path(
+    object_path: str, expiry_seconds: int = 3600
+) -> str | None:
+    """Create a presigned GET URL for an object so clients fetch it directly.
+
+    Args:
+        object_path: Full object path in bucket
+        expiry_seconds: Lifetime of the URL
+
+    Returns:
+        The presigned URL, or None if MinIO is disabled or signing fails
+    """
+    client = _get_minio_client()
+    if client is None:
+        return None
+
+    bucket = settings.MINIO_BUCKET_NAME
+
+    def _presign() -> str | None:
+        try:
+            return client.presigned_get_object(
+                bucket, object_path, expires=timedelta(seconds=expiry_seconds)
+            )
+        except S3Error:
+            logger.exception("Failed to presign object %s", object_path)
+            return None
+
+    return await asyncio.to_thread(_presign)
+
+
+async def stat_object_by_path(object_path: str) -> tuple[int | None, str | None]:
+    """Fetch size and ETag for an object from MinIO.
+
+    Args:
+        object_path: Full object path in bucket
+
+    Returns:
+        (size, etag) tuple; both None if MinIO is disabled or the stat fails
+    """
+    client = _get_minio_client()
+    if client is None:
+        return None, None
+
+    bucket = settings.MINIO_BUCKET_NAME
+
+    def _stat() -> tuple[int | None, str | None]:
+        try:
+            stat = client.stat_object(bucket, object_path)
+        except S3Error as exc:
+            if exc.code in {"NoSuchKey", "NoSuchObject"}:
+                logger.debug("Object not found: %s", object_path)
+            else:
+                logger.exception("Failed to stat object %s", object_path)
+            return None, None
+        return stat.size, stat.etag
+
+    return await asyncio.to_thread(_stat)
+
+
+async def stream_object_by_path(
+    object_path: str, chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """Yield an object's bytes from MinIO in fixed-size chunks.
+
+    Keeps per-request memory at one chunk instead of the whole object.
+
+    Args:
+        object_path: Full object path in bucket
+        chunk_size: Bytes to read per chunk
+
+    Raises:
+        FileNotFoundError: If MinIO is disabled or the object does not exist
+    """
+    client = _get_minio_client()
+    if client is None:
+        raise FileNotFoundError(object_path)
+
+    bucket = settings.MINIO_BUCKET_NAME
+
+    try:
+        response = await asyncio.to_thread(client.get_object, bucket, object_path)
+    except S3Error as exc:
+        if exc.code in {"NoSuchKey", "NoSuchObject"}:
+            logger.debug("Object not found: %s", object_path)
+            raise FileNotFoundError(object_path) from exc
+        logger.exception("Failed to open object stream %s", object_path)
+        raise
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(response.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        response.close()
+        response.release_conn()
+
+
 async def list_user_media_objects(user_id: str) -> list[UserMediaObject]:
     """List all media objects for a specific user using tag filtering.
 